@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Wall time of N concurrent `AsyncVaultClient.get_item` calls against a
+server that answers each request after a fixed latency, compared with the
+same calls made one after another.
+
+python -m benchmarks.bench_async --callers 50 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+from vault_management_api import AsyncVaultClient
+
+from .fake_server import FakeVaultServer
+
+
+async def sequential(client, ids):
+    return [await client.get_item(_id) for _id in ids]
+
+
+async def concurrent(client, ids):
+    return await asyncio.gather(*(client.get_item(_id) for _id in ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=args.callers, latency=args.latency) as server:
+        ids = list(server.items)
+
+        async def run(fetch):
+            async with AsyncVaultClient(server.url, limit=args.callers) as client:
+                await client.status()  # open the session outside the timing
+                start = time.perf_counter()
+                items = await fetch(client, ids)
+                elapsed = time.perf_counter() - start
+            assert [item.id for item in items] == ids
+            return elapsed
+
+        for name, fetch in (("sequential", sequential), ("concurrent", concurrent)):
+            elapsed = asyncio.run(run(fetch))
+            print(
+                f"{name:<11} {args.callers} get_item -> {elapsed:6.3f} s"
+                f" ({elapsed / args.latency:5.1f} x latency)"
+            )
+        # all requests overlap: close to one latency, far below N of them
+        assert elapsed < max(4 * args.latency, args.callers * args.latency / 5), elapsed
+
+
+if __name__ == "__main__":
+    main()
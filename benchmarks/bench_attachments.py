@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Throughput and peak traced memory of streamed attachment transfers.
+
+python -m benchmarks.bench_attachments --size-mb 64 --count 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from vault_management_api import VaultClient
+
+from .fake_server import FakeVaultServer
+
+
+def measure(name, fn, total_bytes):
+    """Time `fn` untraced, then run it again under tracemalloc for the peak."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<24} {total_bytes / 2**20 / elapsed:9.1f} MiB/s"
+        f" {peak / 2**20:9.2f} MiB peak"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--count", type=int, default=4)
+    args = parser.parse_args()
+    size = args.size_mb * 2**20
+
+    with tempfile.TemporaryDirectory() as tmp, FakeVaultServer(items=10) as server:
+        client = VaultClient(server.url, pool_maxsize=args.count)
+        item_ids = list(server.items)[: args.count]
+        sources = []
+        for n in range(args.count):
+            path = os.path.join(tmp, f"upload-{n}.bin")
+            with open(path, "wb") as f:
+                for _ in range(args.size_mb):
+                    f.write(os.urandom(2**20))
+            sources.append(path)
+
+        print(f"{args.count} x {args.size_mb} MiB")
+        uploads = list(zip(item_ids, sources))
+        measure(
+            "add_attachments",
+            lambda: client.add_attachments(uploads),
+            size * args.count,
+        )
+        downloads = [
+            (item_id, server.items[item_id]["attachments"][0]["id"])
+            for item_id in item_ids
+        ]
+        measure(
+            "download_attachments",
+            lambda: client.download_attachments(
+                (i, a, os.path.join(tmp, f"download-{n}.bin"))
+                for n, (i, a) in enumerate(downloads)
+            ),
+            size * args.count,
+        )
+        measure(
+            "get_attachment (1 file)",
+            lambda: client.get_attachment(*downloads[0]),
+            size,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Throughput and peak traced memory of `export_vault` and `import_vault`.
+
+python -m benchmarks.bench_backup --items 50000
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from vault_management_api import VaultClient, export_vault, import_vault
+
+from .fake_server import FakeVaultServer
+
+
+def traced(fn):
+    tracemalloc.start()
+    try:
+        report = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return report, peak
+
+
+def show(name, report, size, peak=None):
+    # the fake server runs in this process, so an import's peak would
+    # include the objects it stores
+    peak = f"{peak / 2**20:7.2f} MiB peak" if peak is not None else ""
+    print(
+        f"{name:<18} {report.total:>8} objects {report.elapsed:8.2f} s"
+        f" {report.throughput:>10,.0f} obj/s {size / 2**20:8.1f} MiB {peak}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with FakeVaultServer(items=args.items) as source:
+            client = VaultClient(source.url)
+            for name in ("vault.jsonl", "vault.jsonl.gz"):
+                path = os.path.join(tmp, name)
+                report, peak = traced(lambda: export_vault(path, client))
+                show(f"export {name}", report, os.path.getsize(path), peak)
+
+        with FakeVaultServer(items=0, folders=0, sends=0) as target:
+            client = VaultClient(target.url, pool_maxsize=args.workers)
+            path = os.path.join(tmp, "vault.jsonl.gz")
+            report = import_vault(path, client, batch_size=args.batch_size)
+            show("import (gzip)", report, os.path.getsize(path))
+            if not report.ok or len(target.items) != args.items:
+                raise SystemExit(f"import failed: {report.failures[:3]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Decode time of `Item.from_dict` versus the compiled decoder.
+
+python -m benchmarks.bench_decode --items 100000
+"""
+
+import argparse
+import time
+
+from vault_management_api import Item, decode_item
+
+from .synthetic import make_items
+
+
+def timed(fn, raw):
+    start = time.perf_counter()
+    result = [fn(item) for item in raw]
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    raw = make_items(args.items)
+    reference, old = timed(Item.from_dict, raw)
+    compiled, new = timed(decode_item, raw)
+    if compiled != reference:
+        raise SystemExit("compiled decoder output differs from Item.from_dict")
+    print(f"Item.from_dict  {old:8.3f} s  {args.items / old:>10,.0f} items/s")
+    print(f"decode_item     {new:8.3f} s  {args.items / new:>10,.0f} items/s")
+    print(f"speedup         {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
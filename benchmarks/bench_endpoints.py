@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Per-endpoint latency, request throughput and model decode/encode cost
+against a local fake `bw serve`.
+
+python -m benchmarks.bench_endpoints --items 1000 --latency 0.005
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from vault_management_api import Item, VaultClient
+
+from .fake_server import FakeVaultServer
+from .synthetic import make_items
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def report(name, samples, wall):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{name:<18} {percentile(ms, 0.5):8.2f} {percentile(ms, 0.9):8.2f}"
+        f" {percentile(ms, 0.99):8.2f} {len(samples) / wall:10.1f}"
+    )
+
+
+def run(fn, args, requests, threads):
+    """Call `fn` on each of `args` (cycled to `requests` calls) from
+    `threads` workers, returning the per-call latencies and the wall time."""
+
+    def timed(arg):
+        start = time.perf_counter()
+        fn(arg)
+        return time.perf_counter() - start
+
+    calls = [args[i % len(args)] for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        samples = list(pool.map(timed, calls))
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=args.items, latency=args.latency) as server:
+        client = VaultClient(server.url, pool_maxsize=args.threads)
+        items = client.get_items()
+        ids = [item.id for item in items]
+        logins = [item.id for item in items if item.login and item.login.password]
+        folders = [folder.id for folder in client.get_folders()]
+        sends = list(server.sends)  # the Send model does not keep its id
+        lists = max(1, args.requests // 50)
+
+        endpoints = [
+            ("get_item", client.get_item, ids, args.requests),
+            ("get_password", client.get_password, logins, args.requests),
+            ("get_username", client.get_username, logins, args.requests),
+            ("get_folder", client.get_folder, folders, args.requests),
+            ("get_send", client.get_send, sends, args.requests),
+            ("get_folders", lambda _: client.get_folders(), [None], args.requests),
+            ("get_sends", lambda _: client.get_sends(), [None], args.requests),
+            ("get_items", lambda _: client.get_items(), [None], lists),
+            ("edit_item", lambda i: client.edit_item(i.id, i), items, lists),
+        ]
+
+        print(f"{args.items} items, {args.latency * 1000:g} ms server latency")
+        print(
+            f"{'endpoint':<18} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'req/s':>10}"
+        )
+        with client:
+            for name, fn, inputs, requests in endpoints:
+                if inputs:
+                    report(name, *run(fn, inputs, requests, args.threads))
+
+    raw = make_items(args.items)
+    start = time.perf_counter()
+    decoded = [Item.from_dict(obj) for obj in raw]
+    decode = time.perf_counter() - start
+    start = time.perf_counter()
+    for item in decoded:
+        item.to_dict()
+    encode = time.perf_counter() - start
+    print(f"{'from_dict':<18} {decode / len(raw) * 1e6:8.2f} us/item")
+    print(f"{'to_dict':<18} {encode / len(raw) * 1e6:8.2f} us/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Peak traced memory of `get_items()` versus `iter_items()`.
+
+python -m benchmarks.bench_iter_items --items 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from vault_management_api import SessionManager, VaultClient
+
+from .fake_server import FakeVaultServer
+
+
+def measure(name, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<24} {count:>8} items {elapsed:8.2f} s {peak / 2**20:10.1f} MiB peak")
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=args.items) as server:
+        client = VaultClient(server.url)
+        measure("get_items", lambda: len(client.get_items()))
+        peak = measure("iter_items", lambda: sum(1 for _ in client.iter_items()))
+        # the locked-vault check must not buffer successful streamed responses
+        managed = VaultClient(server.url, session_manager=SessionManager(str))
+        managed_peak = measure(
+            "iter_items (session)", lambda: sum(1 for _ in managed.iter_items())
+        )
+        assert managed_peak < max(2 * peak, 2**20), (managed_peak, peak)
+
+
+if __name__ == "__main__":
+    main()
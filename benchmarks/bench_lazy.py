@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Listing workloads with `decode_item` versus `LazyItem`.
+
+python -m benchmarks.bench_lazy --items 100000
+"""
+
+import argparse
+import time
+from dataclasses import replace
+
+from vault_management_api import LazyItem, decode_item
+
+from .synthetic import make_items
+
+
+def names(items):
+    return [item.name for item in items]
+
+
+def usernames(items):
+    return [item.login.username for item in items if item.login is not None]
+
+
+def payloads(items):
+    return [item.to_dict() for item in items]
+
+
+WORKLOADS = (
+    ("list names", names),
+    ("list usernames", usernames),
+    ("decode + to_dict", payloads),
+)
+
+
+def check_payload_reuse(raw):
+    """Reads keep the payload; assignments and in-place changes do not."""
+    login = next(item for item in raw if item.get("login"))
+    item = LazyItem(login)
+    repr(item)
+    assert item == decode_item(login) and item.login.username is not None
+    assert not item.modified and item.to_dict() is login
+    item.login.username = "changed"
+    assert item.modified and item.to_dict()["login"]["username"] == "changed"
+
+    renamed = replace(LazyItem(login), name="renamed")
+    assert isinstance(renamed, LazyItem) and renamed.modified
+    assert renamed == replace(decode_item(login), name="renamed")
+    assert renamed.to_dict()["name"] == "renamed"
+
+
+def timed(decode, workload, raw, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload([decode(item) for item in raw])
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    raw = make_items(args.items)
+    if [LazyItem(item) for item in raw] != [decode_item(item) for item in raw]:
+        raise SystemExit("LazyItem differs from decode_item")
+    check_payload_reuse(raw)
+    print(f"{'workload':<18} {'decode_item':>12} {'LazyItem':>12} {'speedup':>8}")
+    for name, workload in WORKLOADS:
+        eager = timed(decode_item, workload, raw)
+        lazy = timed(LazyItem, workload, raw)
+        print(f"{name:<18} {eager:10.3f} s {lazy:10.3f} s {eager / lazy:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""`UriMatcher.match_url` versus scanning every login URI, at 100k URIs.
+
+python -m benchmarks.bench_matcher --uris 100000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from vault_management_api import UriMatcher, decode_item
+from vault_management_api.matcher import base_domain, split_host
+
+from .synthetic import make_item
+
+# DOMAIN, HOST, STARTS_WITH, EXACT, REGULAR_EXPRESSION, NEVER, unset
+MATCH_WEIGHTS = (30, 15, 10, 10, 0.1, 2, 33)
+
+
+def make_vault(uris: int, sites: int, rng: random.Random):
+    items = []
+    while uris > 0:
+        raw = make_item(len(items), rng)
+        if raw["login"] is not None:
+            raw["login"]["uris"] = []
+            for _ in range(min(uris, rng.randint(1, 3))):
+                site = (
+                    f"site{rng.randrange(sites)}.{rng.choice(('com', 'co.uk', 'io'))}"
+                )
+                match = rng.choices((0, 1, 2, 3, 4, 5, None), MATCH_WEIGHTS)[0]
+                uri = f"https://{rng.choice(('', 'www.', 'app.'))}{site}/"
+                if match == 2:
+                    uri += rng.choice(("", "login", "account/"))
+                elif match == 4:
+                    uri = rf"^https://[^/]*{re.escape(site)}/admin"
+                raw["login"]["uris"].append({"match": match, "uri": uri})
+                uris -= 1
+        items.append(decode_item(raw))
+    return items
+
+
+def scan(items, url):
+    """Reference implementation: parse and test every URI."""
+    host, port = split_host(url)
+    found = []
+    for item in items:
+        for uri in (item.login.uris if item.login else None) or ():
+            match = uri.match.value if uri.match is not None else 0
+            if match == 3:
+                ok = url == uri.uri
+            elif match == 2:
+                ok = url.startswith(uri.uri)
+            elif match == 4:
+                ok = re.search(uri.uri, url, re.IGNORECASE) is not None
+            elif match in (0, 1):
+                uri_host, uri_port = split_host(uri.uri)
+                if match == 1:
+                    ok = (uri_host, uri_port) == (host, port)
+                else:
+                    domain = base_domain(uri_host)
+                    ok = host == domain or host.endswith("." + domain)
+            else:
+                ok = False
+            if ok:
+                found.append(item)
+                break
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uris", type=int, default=100000)
+    parser.add_argument("--sites", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--scans", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    items = make_vault(args.uris, args.sites, rng)
+    start = time.perf_counter()
+    matcher = UriMatcher(items)
+    built = time.perf_counter() - start
+    print(f"{len(items)} items, {matcher.uris} URIs, index built in {built:.2f} s")
+
+    urls = [
+        f"https://{rng.choice(('', 'www.', 'm.'))}site{rng.randrange(args.sites)}"
+        f".{rng.choice(('com', 'co.uk', 'io'))}/{rng.choice(('', 'login', 'admin'))}"
+        for _ in range(args.queries)
+    ]
+    for url in urls[: args.scans]:
+        expected = {id(item) for item in scan(items, url)}
+        if {id(item) for item in matcher.match_url(url)} != expected:
+            raise SystemExit(f"UriMatcher disagrees with the scan for {url}")
+
+    start = time.perf_counter()
+    for url in urls[: args.scans]:
+        scan(items, url)
+    scanned = (time.perf_counter() - start) / args.scans
+    start = time.perf_counter()
+    matches = sum(len(matcher.match_url(url)) for url in urls)
+    indexed = (time.perf_counter() - start) / len(urls)
+    print(f"scan        {scanned * 1e3:10.3f} ms/query")
+    print(f"match_url   {indexed * 1e3:10.3f} ms/query")
+    print(
+        f"speedup     {scanned / indexed:10.0f}x ({matches / len(urls):.1f} items/query)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Retained memory per decoded item: `Item` versus `CompactItem`.
+
+python -m benchmarks.bench_memory --items 100000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from vault_management_api import decode_compact_item, decode_item
+
+from .synthetic import make_items
+
+
+def retained(decoder, payload: bytes, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    items = [decoder(raw) for raw in json.loads(payload)["data"]["data"]]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    # Decode from JSON so strings are fresh objects, as in a real response.
+    orgs = [f"org-{i}" for i in range(5)]
+    folders = [f"folder-{i}" for i in range(50)]
+    raw = make_items(args.items, organizations=orgs, folders=folders)
+    payload = json.dumps({"data": {"data": raw}}).encode()
+    del raw
+
+    regular = retained(decode_item, payload, args.items)
+    compact = retained(decode_compact_item, payload, args.items)
+    print(f"Item         {regular:8.0f} bytes/item")
+    print(f"CompactItem  {compact:8.0f} bytes/item")
+    print(f"saving       {1 - compact / regular:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Reads against a server that answers every other request with a non-JSON
+503 (as proxies do): attempts made and time taken per client.
+
+python -m benchmarks.bench_retry --reads 200
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from vault_management_api import AsyncVaultClient, RetryPolicy, VaultClient
+
+from .fake_server import FakeVaultServer
+
+RETRY = RetryPolicy(attempts=3, backoff=0.001)
+
+
+def flaky(server):
+    """Make every other request fail with an HTML 503."""
+    handle = server.handle
+    lock = threading.Lock()
+    calls = [0]
+
+    def flaky_handle(method, path, query, body):
+        with lock:
+            calls[0] += 1
+            fail = calls[0] % 2 == 1
+        if fail:
+            return 503, b"<html><body>503 Service Unavailable</body></html>"
+        return handle(method, path, query, body)
+
+    server.handle = flaky_handle
+
+
+def threaded(server, item_id, reads):
+    with VaultClient(server.url, retry=RETRY) as client:
+        for _ in range(reads):
+            assert client.get_item(item_id).id == item_id
+
+
+def asynchronous(server, item_id, reads):
+    async def main():
+        async with AsyncVaultClient(server.url, retry=RETRY) as client:
+            for _ in range(reads):
+                assert (await client.get_item(item_id)).id == item_id
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=10) as server:
+        item_id = next(iter(server.items))
+        flaky(server)
+        for name, run in (("threads", threaded), ("asyncio", asynchronous)):
+            before = server.requests
+            start = time.perf_counter()
+            run(server, item_id, args.reads)
+            elapsed = time.perf_counter() - start
+            requests = server.requests - before
+            print(
+                f"{name:<8} {args.reads} reads -> {requests:>4} attempts"
+                f" in {elapsed:6.3f} s"
+            )
+            assert requests == 2 * args.reads, requests
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Requests and unlocks made by N concurrent readers of a vault that locks
+mid-run: a `status()` check before every read versus a `SessionManager`.
+
+python -m benchmarks.bench_session --callers 50 --reads 20 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from vault_management_api import (
+    AsyncSessionManager,
+    AsyncVaultClient,
+    SessionManager,
+    VaultClient,
+)
+
+from .fake_server import FakeVaultServer
+
+PASSWORD = "correct horse battery staple"
+
+
+def preflight(client, item_id):
+    if client.status()["data"]["template"]["status"] == "locked":
+        client.unlock(PASSWORD)
+    return client.get_item(item_id)
+
+
+def threaded(server, item_id, callers, reads, managed):
+    manager = SessionManager(lambda: PASSWORD) if managed else None
+    client = VaultClient(server.url, pool_maxsize=callers, session_manager=manager)
+    barrier = threading.Barrier(callers)
+    errors = []
+
+    def call(n):
+        barrier.wait()
+        try:
+            for i in range(reads):
+                if n == 0 and i == reads // 2:
+                    server.locked = True
+                if managed:
+                    client.get_item(item_id)
+                else:
+                    preflight(client, item_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+    return errors
+
+
+def asynchronous(server, item_id, callers, reads, managed):
+    manager = AsyncSessionManager(lambda: PASSWORD) if managed else None
+    errors = []
+
+    async def main():
+        async with AsyncVaultClient(
+            server.url, limit=callers, session_manager=manager
+        ) as client:
+
+            async def call(n):
+                for i in range(reads):
+                    if n == 0 and i == reads // 2:
+                        server.locked = True
+                    if managed:
+                        await client.get_item(item_id)
+                    else:
+                        status = await client.status()
+                        if status["data"]["template"]["status"] == "locked":
+                            await client.unlock(PASSWORD)
+                        await client.get_item(item_id)
+
+            outcomes = await asyncio.gather(
+                *(call(n) for n in range(callers)), return_exceptions=True
+            )
+            errors.extend(e for e in outcomes if isinstance(e, Exception))
+
+    asyncio.run(main())
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--reads", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.002)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=10, latency=args.latency) as server:
+        server.password = PASSWORD
+        item_id = next(iter(server.items))
+        for name, run in (("threads", threaded), ("asyncio", asynchronous)):
+            for managed in (False, True):
+                server.locked = False
+                requests, unlocks = server.requests, server.unlocks
+                start = time.perf_counter()
+                errors = run(server, item_id, args.callers, args.reads, managed)
+                elapsed = time.perf_counter() - start
+                requests = server.requests - requests
+                unlocks = server.unlocks - unlocks
+                mode = "session manager" if managed else "status() first"
+                print(
+                    f"{name:<8} {mode:<16} {requests:>6} requests"
+                    f" {unlocks:>3} unlocks {len(errors):>3} errors"
+                    f" in {elapsed:6.3f} s"
+                )
+                if managed:
+                    assert unlocks == 1 and not errors, (unlocks, errors[:3])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Backend requests made by N concurrent identical reads, with and without
+single-flight coalescing, for threads and asyncio.
+
+python -m benchmarks.bench_singleflight --callers 50 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from vault_management_api import AsyncVaultClient, VaultClient
+
+from .fake_server import FakeVaultServer
+
+
+def threaded(server, item_id, callers, singleflight):
+    client = VaultClient(server.url, pool_maxsize=callers, singleflight=singleflight)
+    barrier = threading.Barrier(callers)
+    results = [None] * callers
+
+    def call(n):
+        barrier.wait()
+        results[n] = client.get_item(item_id)
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+    assert all(result == results[0] for result in results)
+
+
+def asynchronous(server, item_id, callers, singleflight):
+    async def main():
+        async with AsyncVaultClient(
+            server.url, limit=callers, singleflight=singleflight
+        ) as client:
+            results = await asyncio.gather(
+                *(client.get_item(item_id) for _ in range(callers))
+            )
+        assert all(result == results[0] for result in results)
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=10, latency=args.latency) as server:
+        item_id = next(iter(server.items))
+        for name, run in (("threads", threaded), ("asyncio", asynchronous)):
+            for singleflight in (False, True):
+                before = server.requests
+                start = time.perf_counter()
+                run(server, item_id, args.callers, singleflight)
+                elapsed = time.perf_counter() - start
+                requests = server.requests - before
+                print(
+                    f"{name:<8} singleflight={singleflight!s:<5} {args.callers} callers"
+                    f" -> {requests:>3} requests in {elapsed:6.3f} s"
+                )
+                if singleflight:
+                    assert requests == 1, requests
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Backend syncs made by components that each ask for a sync at random
+times: calling `sync()` directly versus `SyncScheduler.request_sync`.
+
+python -m benchmarks.bench_sync --components 8 --requests 5 --window 0.2
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from vault_management_api import SyncScheduler, VaultClient
+
+from .fake_server import FakeVaultServer
+
+
+def run(server, components, requests, spread, sync):
+    barrier = threading.Barrier(components)
+
+    def component(seed):
+        rng = random.Random(seed)
+        barrier.wait()
+        for _ in range(requests):
+            time.sleep(rng.uniform(0, spread))
+            sync()
+
+    threads = [threading.Thread(target=component, args=(n,)) for n in range(components)]
+    before = server.syncs
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return server.syncs - before, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--window", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    calls = args.components * args.requests
+
+    with FakeVaultServer(items=10, latency=args.latency) as server:
+        client = VaultClient(server.url, pool_maxsize=args.components)
+        syncs, elapsed = run(
+            server, args.components, args.requests, args.spread, client.sync
+        )
+        print(
+            f"direct sync()      {calls} calls -> {syncs:>3} syncs in {elapsed:.2f} s"
+        )
+
+        with SyncScheduler(client, interval=3600, window=args.window) as scheduler:
+            syncs, elapsed = run(
+                server,
+                args.components,
+                args.requests,
+                args.spread,
+                lambda: scheduler.request_sync(wait=True),
+            )
+            print(
+                f"request_sync(wait) {calls} calls -> {syncs:>3} syncs in {elapsed:.2f} s"
+                f" (last took {scheduler.last_duration * 1000:.1f} ms)"
+            )
+            assert scheduler.requests == calls and syncs == scheduler.syncs
+            assert syncs < calls
+
+
+if __name__ == "__main__":
+    main()
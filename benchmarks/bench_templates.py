@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Time to render a template referencing M items of an N-item vault,
+resolved from one streamed item list, with every value checked.
+
+python -m benchmarks.bench_templates --items 20000 --references 200
+"""
+
+import argparse
+import time
+
+from vault_management_api import (
+    FieldType,
+    TemplateRenderer,
+    VaultClient,
+    VaultMirror,
+    decode_item,
+)
+
+from .fake_server import FakeVaultServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--references", type=int, default=200)
+    args = parser.parse_args()
+
+    with FakeVaultServer(items=args.items) as server:
+        # server-shaped custom fields, as `bw serve` lists them
+        ids = list(server.items)[: args.references]
+        for n, _id in enumerate(ids):
+            server.items[_id]["fields"] = [
+                {"name": "env", "value": f"env-{n}", "type": 0, "linkedId": None},
+                {"name": "token", "value": f"t-{n}", "type": 1, "linkedId": None},
+            ]
+        server._items_changed()
+        fields = decode_item(server.items[ids[0]]).fields
+        assert [f.type for f in fields] == [FieldType.TEXT, FieldType.HIDDEN]
+
+        template = "".join(
+            f"{_id} {{{{ vault:{_id}:fields.env }}}} {{{{ vault:{_id}:fields.token }}}}\n"
+            for _id in ids
+        )
+        expected = "".join(f"{_id} env-{n} t-{n}\n" for n, _id in enumerate(ids))
+        client = VaultClient(server.url)
+
+        start = time.perf_counter()
+        rendered = TemplateRenderer(client).render(template)
+        elapsed = time.perf_counter() - start
+        assert rendered == expected
+        print(f"streamed list  {2 * len(ids)} references in {elapsed * 1000:8.1f} ms")
+
+        mirror = VaultMirror.load(client)
+        start = time.perf_counter()
+        rendered = TemplateRenderer(mirror=mirror).render(template)
+        elapsed = time.perf_counter() - start
+        assert rendered == expected
+        print(f"VaultMirror    {2 * len(ids)} references in {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .synthetic import make_items
+
+
+class _StoredFile(str):
+    """Path of an attachment on disk, streamed back in chunks."""
+
+
+def _ok(data) -> dict:
+    return {"success": True, "data": data}
+
+
+def _list(data) -> dict:
+    return _ok({"object": "list", "data": data})
+
+
+def _string(value) -> dict:
+    return _ok({"object": "string", "data": value})
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # bursts of concurrent connects in benchmarks
+
+
+class FakeVaultServer:
+    """Stand-in for `bw serve` on a local port, serving a synthetic vault.
+
+    `items`, `folders` and `sends` set the size of the generated vault and
+    every request sleeps `latency` seconds before it is answered. The list
+    body for `/list/object/items` is encoded up front (and again only after
+    a write), and attachments are streamed to and from files in a temporary
+    directory, so benchmarks that trace allocations in the client are not
+    charged for the server. `requests` counts handled requests.
+
+    Setting `locked` makes every endpoint but `/status` and `/unlock` fail
+    the way `bw serve` does until `/unlock` is called with `password` (any
+    password if it is None); `unlocks` counts successful unlocks and
+    `syncs` calls to `/sync`.
+    """
+
+    def __init__(
+        self,
+        items: int = 1000,
+        folders: int = 20,
+        sends: int = 20,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.requests = 0
+        self.locked = False
+        self.password = None
+        self.unlocks = 0
+        self.syncs = 0
+        self.folders = {
+            f"folder-{i}": {"object": "folder", "id": f"folder-{i}", "name": f"F{i}"}
+            for i in range(folders)
+        }
+        self.items = {
+            item["id"]: item for item in make_items(items, folders=list(self.folders))
+        }
+        self.sends = {f"send-{i}": self._make_send(i) for i in range(sends)}
+        self.attachments = {}
+        self.attachment_dir = tempfile.mkdtemp(prefix="fake-bw-")
+        self._lock = threading.Lock()
+        self._list_body = None
+        self.httpd = _HTTPServer((host, port), self._handler())
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+
+    @staticmethod
+    def _make_send(i: int) -> dict:
+        return {
+            "object": "send",
+            "id": f"send-{i}",
+            "name": f"Send {i}",
+            "notes": None,
+            "type": 0,
+            "text": {"text": f"secret {i}", "hidden": False},
+            "file": None,
+            "maxAccessCount": None,
+            "deletionDate": "2030-01-01T00:00:00.000Z",
+            "expirationDate": None,
+            "password": None,
+            "disabled": False,
+            "hideEmail": False,
+        }
+
+    def list_body(self) -> bytes:
+        with self._lock:
+            if self._list_body is None:
+                self._list_body = json.dumps(_list(list(self.items.values()))).encode()
+            return self._list_body
+
+    def start(self) -> "FakeVaultServer":
+        self.list_body()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.attachment_dir, ignore_errors=True)
+
+    def __enter__(self) -> "FakeVaultServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _items_changed(self) -> None:
+        with self._lock:
+            self._list_body = None
+
+    def handle(self, method: str, path: list, query: dict, body):
+        """Return `(status, payload)` for one request."""
+        items = self.items
+        if self.locked and path not in (["status"], ["unlock"]):
+            return 400, {"success": False, "message": "Vault is locked."}
+        if method == "GET":
+            if path == ["list", "object", "items"]:
+                if not query:
+                    return 200, None  # served from the pre-encoded body
+                return 200, _list(self.filter_items(query))
+            if path == ["list", "object", "folders"]:
+                return 200, _list(list(self.folders.values()))
+            if path == ["list", "object", "send"]:
+                return 200, _list(list(self.sends.values()))
+            if path[:2] == ["list", "object"]:
+                return 200, _list([])
+            if path == ["status"]:
+                return 200, _ok(
+                    {
+                        "object": "template",
+                        "template": {"status": "locked" if self.locked else "unlocked"},
+                    }
+                )
+            if path == ["generate"]:
+                return 200, _string(uuid.uuid4().hex)
+            if len(path) == 3 and path[0] == "object":
+                kind, _id = path[1], path[2]
+                if kind == "item" and _id in items:
+                    return 200, _ok(items[_id])
+                if kind == "folder" and _id in self.folders:
+                    return 200, _ok(self.folders[_id])
+                if kind == "send" and _id in self.sends:
+                    return 200, _ok(self.sends[_id])
+                if kind == "attachment" and _id in self.attachments:
+                    return 200, _StoredFile(self.attachments[_id])
+                login = (items.get(_id) or {}).get("login") or {}
+                if kind in ("username", "password") and login.get(kind) is not None:
+                    return 200, _string(login[kind])
+                if kind == "totp" and login.get("totp"):
+                    return 200, _string("123456")
+                if kind == "notes" and (items.get(_id) or {}).get("notes"):
+                    return 200, _string(items[_id]["notes"])
+        elif method == "POST":
+            if path == ["unlock"]:
+                password = (body or {}).get("password")
+                if self.password is not None and password != self.password:
+                    return 400, {
+                        "success": False,
+                        "message": "Invalid master password.",
+                    }
+                with self._lock:
+                    self.locked = False
+                    self.unlocks += 1
+            if path == ["lock"]:
+                self.locked = True
+            if path == ["sync"]:
+                with self._lock:
+                    self.syncs += 1
+            if path in (["sync"], ["lock"], ["unlock"]):
+                return 200, _ok({"object": "message", "title": path[0]})
+            if path == ["object", "item"]:
+                item = dict(body, id=str(uuid.uuid4()), object="item")
+                items[item["id"]] = item
+                self._items_changed()
+                return 200, _ok(item)
+            if path == ["object", "folder"]:
+                folder = {"object": "folder", "id": str(uuid.uuid4()), **body}
+                self.folders[folder["id"]] = folder
+                return 200, _ok(folder)
+            if path == ["object", "send"]:
+                send = dict(body, id=str(uuid.uuid4()), object="send")
+                self.sends[send["id"]] = send
+                return 200, _ok(send)
+            if path[0] in ("restore", "move", "confirm"):
+                return 200, {"success": True}
+        elif method == "PUT":
+            if path[:2] == ["object", "item"] and path[2] in items:
+                items[path[2]] = dict(body, id=path[2], object="item")
+                self._items_changed()
+                return 200, _ok(items[path[2]])
+            if path[:2] == ["object", "folder"] and path[2] in self.folders:
+                self.folders[path[2]].update(body)
+                return 200, _ok(self.folders[path[2]])
+        elif method == "DELETE":
+            if path[:2] == ["object", "item"] and items.pop(path[2], None):
+                self._items_changed()
+                return 200, {"success": True}
+            if path[:2] == ["object", "folder"] and self.folders.pop(path[2], None):
+                return 200, {"success": True}
+            if path[:2] == ["object", "attachment"] and path[2] in self.attachments:
+                os.remove(self.attachments.pop(path[2]))
+                item = items.get((query.get("itemid") or [None])[0]) or {}
+                item["attachments"] = [
+                    a for a in item.get("attachments") or [] if a["id"] != path[2]
+                ]
+                self._items_changed()
+                return 200, {"success": True}
+        return 404, {"success": False, "message": "Not found."}
+
+    def filter_items(self, query: dict) -> list:
+        """The subset of items `bw serve` returns for list filters."""
+        first = {key: values[0] for key, values in query.items()}
+        search = first.get("search", "").lower()
+        result = []
+        for item in self.items.values():
+            if bool(item.get("deletedDate")) != ("trash" in first):
+                continue
+            if "folderid" in first and item.get("folderId") != first["folderid"]:
+                continue
+            if (
+                "organizationid" in first
+                and item.get("organizationId") != first["organizationid"]
+            ):
+                continue
+            if "collectionid" in first and first["collectionid"] not in (
+                item.get("collectionIds") or ()
+            ):
+                continue
+            if "url" in first and not any(
+                first["url"] in (uri.get("uri") or "")
+                for uri in ((item.get("login") or {}).get("uris") or ())
+            ):
+                continue
+            if search and search not in (item.get("name") or "").lower():
+                continue
+            result.append(item)
+        return result
+
+    def store_attachment(self, query: dict, stream, length: int, content_type: str):
+        """Save the file part of a multipart upload without buffering it."""
+        item = self.items.get((query.get("itemid") or [None])[0])
+        boundary = content_type.partition("boundary=")[2].strip('"')
+        filename, head = "attachment", 0
+        while True:
+            line = stream.readline(65536)
+            head += len(line)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            match = re.search(rb'filename="([^"]*)"', line)
+            if match:
+                filename = match.group(1).decode()
+        size = length - head - len(f"\r\n--{boundary}--\r\n")
+        _id = uuid.uuid4().hex[:12]
+        path = os.path.join(self.attachment_dir, _id)
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining > 0:
+                chunk = stream.read(min(65536, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+        stream.read(length - head - size)  # closing boundary
+        if item is None:
+            os.remove(path)
+            return 404, {"success": False, "message": "Item not found."}
+        self.attachments[_id] = path
+        item.setdefault("attachments", []).append(
+            {"id": _id, "fileName": filename, "size": str(size), "url": None}
+        )
+        self._items_changed()
+        return 200, _ok(item)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def send_body(self, body: bytes, status: int = 200, content_type=None):
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type or "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client gave up waiting (timeouts in benchmarks)
+                    self.close_connection = True
+
+            def send_file(self, path: str) -> None:
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(os.path.getsize(path)))
+                    self.end_headers()
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, self.wfile, 65536)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True
+
+            def dispatch(self, method: str) -> None:
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlsplit(self.path)
+                path = url.path.strip("/").split("/")
+                length = int(self.headers.get("Content-Length") or 0)
+                content_type = self.headers.get("Content-Type") or ""
+                if method == "POST" and path == ["object", "attachment"]:
+                    status, payload = server.store_attachment(
+                        parse_qs(url.query), self.rfile, length, content_type
+                    )
+                else:
+                    raw = self.rfile.read(length) if length else b""
+                    is_json = "json" in content_type
+                    body = json.loads(raw) if raw and is_json else raw
+                    status, payload = server.handle(
+                        method, path, parse_qs(url.query), body
+                    )
+                if isinstance(payload, _StoredFile):
+                    self.send_file(payload)
+                elif isinstance(payload, bytes):
+                    self.send_body(payload, status, "application/octet-stream")
+                elif payload is None:
+                    self.send_body(server.list_body(), status)
+                else:
+                    self.send_body(json.dumps(payload).encode(), status)
+
+            def do_GET(self):
+                self.dispatch("GET")
+
+            def do_POST(self):
+                self.dispatch("POST")
+
+            def do_PUT(self):
+                self.dispatch("PUT")
+
+            def do_DELETE(self):
+                self.dispatch("DELETE")
+
+        return Handler
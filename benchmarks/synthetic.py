@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Synthetic `bw serve` payloads shaped like real vault exports."""
+
+import random
+
+IDENTITY_KEYS = (
+    "title firstName middleName lastName address1 address2 address3 city state "
+    "postalCode country company email phone ssn username passportNumber "
+    "licenseNumber"
+).split()
+
+
+def _uuid(rng: random.Random) -> str:
+    h = f"{rng.getrandbits(128):032x}"
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-8{h[17:20]}-{h[20:32]}"
+
+
+def make_item(i: int, rng: random.Random = None, organizations=(), folders=()):
+    rng = rng or random.Random(i)
+    kind = rng.choices((1, 2, 3, 4), weights=(80, 10, 5, 5))[0]
+    item = {
+        "object": "item",
+        "id": _uuid(rng),
+        "organizationId": rng.choice((None,) + tuple(organizations)),
+        "folderId": rng.choice((None,) + tuple(folders)),
+        "type": kind,
+        "reprompt": 0,
+        "name": f"Item {i}",
+        "notes": rng.choice((None, f"Notes for item {i}")),
+        "favorite": rng.random() < 0.1,
+        "fields": (
+            [{"name": "env", "value": "prod", "type": 0, "linkedId": None}]
+            if rng.random() < 0.2
+            else None
+        ),
+        "login": None,
+        "secureNote": None,
+        "card": None,
+        "identity": None,
+        "collectionIds": [],
+        "revisionDate": "2024-01-01T00:00:00.000Z",
+        "creationDate": "2024-01-01T00:00:00.000Z",
+        "deletedDate": None,
+        "passwordHistory": None,
+    }
+    if kind == 1:
+        item["login"] = {
+            "fido2Credentials": [],
+            "uris": [
+                {
+                    "match": rng.choice((None, 0, 1, 3)),
+                    "uri": f"https://{sub}host{rng.randrange(5000)}.example.com/",
+                }
+                for sub in rng.sample(("", "www.", "app.", "login."), rng.randint(1, 3))
+            ],
+            "username": f"user{i}@example.com",
+            "password": f"p@ss-{rng.getrandbits(64):x}",
+            "totp": rng.choice((None, "otpauth://totp/x?secret=JBSWY3DPEHPK3PXP")),
+            "passwordRevisionDate": None,
+        }
+    elif kind == 2:
+        item["secureNote"] = {"type": 0}
+        item["notes"] = f"Secure note {i}"
+    elif kind == 3:
+        item["card"] = {
+            "cardholderName": f"Holder {i}",
+            "brand": rng.choice((1, 2, "Visa")),
+            "number": "4111111111111111",
+            "expMonth": "12",
+            "expYear": "2032",
+            "code": "123",
+        }
+    else:
+        item["identity"] = {key: f"{key} {i}" for key in IDENTITY_KEYS}
+    return item
+
+
+def make_items(count: int, seed: int = 0, organizations=(), folders=()):
+    rng = random.Random(seed)
+    return [make_item(i, rng, organizations, folders) for i in range(count)]
@@ -7,7 +7,8 @@ with open('requirements.txt') as f:
 setup(
     name="vault_management_api",
     version="0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
-    install_requires=required
+    install_requires=required,
+    extras_require={"async": ["aiohttp>=3.8"], "orjson": ["orjson>=3.6"]},
 )
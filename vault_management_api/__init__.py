@@ -1 +1,32 @@
 from .vault_management_api import *
+from .backup import TransferReport, export_vault, import_vault
+from .compact import (
+    COMPACT_DECODERS,
+    CompactCard,
+    CompactField,
+    CompactIdentity,
+    CompactItem,
+    CompactLogin,
+    CompactSecureNote,
+    CompactSend,
+    CompactSendText,
+    CompactUri,
+    decode_compact_item,
+)
+from .jsonlib import JsonBackend, get_backend, set_backend
+from .matcher import UriMatcher
+from .members import MemberRoster, ReconcileSummary, reconcile_members
+from .metrics import Metrics, RequestEvent, prometheus_text
+from .mirror import VaultMirror
+from .multipart import MultipartFile
+from .retry import NO_RETRY, Deadline, DeadlineExceeded, RetryPolicy, deadline
+from .scheduler import SyncScheduler
+from .session import AsyncSessionManager, SessionManager
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .snapshot import ItemChanges, ItemSnapshot, refresh_items
+from .templates import Reference, TemplateRenderer, render_template
+
+try:
+    from .async_client import AsyncVaultClient
+except ImportError:  # aiohttp is an optional dependency
+    pass
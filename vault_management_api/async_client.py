@@ -0,0 +1,859 @@
+#!/usr/bin/env python3
+import asyncio
+import io
+import logging
+import os
+import time
+from dataclasses import replace
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import aiohttp
+
+from .bulk import BulkFailure, BulkReport
+from .cache import MISSING, LRUCache
+from .jsonlib import JSON_CONTENT_TYPE, dumps, loads
+from .metrics import Metrics
+from .multipart import open_upload, upload_name
+from .retry import (
+    NO_RETRY,
+    Deadline,
+    RetryPolicy,
+    Timeout,
+    attempt_timeout,
+    current_deadline,
+    split_timeout,
+)
+from .session import LOCK_ROUTES, AsyncSessionManager, is_locked_body
+from .singleflight import AsyncSingleFlight
+from .streaming import JsonArrayStream
+from .vault_management_api import (
+    BW_SERVER_URL,
+    ITEMS_URL,
+    BatchResult,
+    Collection,
+    Folder,
+    Item,
+    LazyItem,
+    OrgMember,
+    Send,
+    _collection_from_response,
+    _collections_from_response,
+    _error_message,
+    _feed_list,
+    _use_list,
+    _folder_from_response,
+    _batch_result,
+    _folders_from_response,
+    _item_from_response,
+    _items_from_response,
+    _items_url,
+    _lazy_items_from_response,
+    _list_url,
+    _login_values,
+    _open_download,
+    _org_members_from_response,
+    _organizations_from_response,
+    _send_from_response,
+    _sends_from_response,
+    _value_from_response,
+    _value_or_message,
+    decode_item,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _gather_bulk(fn: Callable[[Any], Awaitable], inputs: Iterable) -> BulkReport:
+    """`run_bulk` for coroutines; concurrency is bounded by the client."""
+    inputs = list(inputs)
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*map(fn, inputs), return_exceptions=True)
+    report = BulkReport(elapsed=time.perf_counter() - start)
+    for index, (value, outcome) in enumerate(zip(inputs, outcomes)):
+        if isinstance(outcome, Exception):
+            report.results.append(None)
+            report.failures.append(BulkFailure(index, value, outcome))
+        else:
+            report.results.append(outcome)
+    return report
+
+
+class AsyncVaultClient:
+    """asyncio counterpart of `VaultClient`.
+
+    All coroutines share one `aiohttp.ClientSession` (and therefore one
+    connection pool of at most `limit` connections). `max_concurrency` bounds
+    the number of requests in flight at once; it defaults to `limit`. The
+    session is created lazily on first use, inside the running event loop.
+    `cache`, `metrics`, `timeout`, `deadline`, `retry` and `singleflight`
+    behave as they do on `VaultClient`; `with deadline(seconds):` also bounds requests made by
+    tasks created inside the block. `session_manager` takes an
+    `AsyncSessionManager`.
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        limit: int = 10,
+        max_concurrency: int = None,
+        keep_alive: bool = True,
+        headers: dict = None,
+        cache: LRUCache = None,
+        metrics: Metrics = None,
+        timeout: Timeout = (5.0, 60.0),
+        deadline: float = None,
+        retry: RetryPolicy = None,
+        singleflight: bool = False,
+        session_manager: AsyncSessionManager = None,
+    ):
+        self.base_url = (base_url or BW_SERVER_URL).rstrip("/")
+        self.limit = limit
+        self.keep_alive = keep_alive
+        self.headers = headers
+        self.cache = cache
+        self.metrics = metrics
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry = retry or RetryPolicy()
+        self.singleflight = AsyncSingleFlight() if singleflight else None
+        self.vault_size: Optional[int] = None
+        self.session_manager = session_manager
+        self._semaphore = asyncio.Semaphore(max_concurrency or limit)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, force_close=not self.keep_alive
+            )
+            connect, read = split_timeout(self.timeout)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(connect=connect, sock_read=read),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncVaultClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _url(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path}"
+
+    async def _cached(self, key: tuple, fetch: Callable[[], Awaitable]) -> Any:
+        if self.cache is None:
+            return await fetch()
+        value = self.cache.get(key)
+        if value is MISSING:
+            version = self.cache.version
+            value = await fetch()
+            self.cache.set(key, value, version)
+        return value
+
+    def _invalidate(self, *key) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(key)
+
+    def _decode(self, decode: Callable[..., Any], response: dict, *args) -> Any:
+        if self.metrics is None:
+            return decode(response, *args)
+        start = time.perf_counter()
+        try:
+            return decode(response, *args)
+        finally:
+            self.metrics.observe_decode(
+                decode.__name__[1 : -len("_from_response")],
+                time.perf_counter() - start,
+            )
+
+    def _deadline(self, seconds: Optional[float]) -> Optional[Deadline]:
+        return Deadline.earliest(
+            Deadline(seconds) if seconds is not None else None,
+            Deadline(self.deadline) if self.deadline is not None else None,
+            current_deadline(),
+        )
+
+    def _client_timeout(self, budget: Optional[Deadline]) -> aiohttp.ClientTimeout:
+        connect, read = attempt_timeout(self.timeout, budget)
+        total = budget.remaining() if budget is not None else None
+        return aiohttp.ClientTimeout(total=total, connect=connect, sock_read=read)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        deadline: float = None,
+        retry: RetryPolicy = None,
+        **kwargs,
+    ) -> dict:
+        _, body = await self._exchange(method, url, deadline, retry, **kwargs)
+        return loads(body)
+
+    async def _exchange(
+        self,
+        method: str,
+        url: str,
+        deadline: Optional[float],
+        retry: Optional[RetryPolicy],
+        **kwargs,
+    ) -> Tuple[aiohttp.ClientResponse, Optional[bytes]]:
+        """Send a request with retries, unlocking the vault and sending it
+        once more if it failed because the vault was locked. Returns the
+        response and its body; see `_attempt` for `stream=True`."""
+        manager = self.session_manager
+        if manager is None or url in LOCK_ROUTES:
+            return await self._retrying(method, url, deadline, retry, **kwargs)
+        seen = manager.generation
+        response, body = await self._retrying(method, url, deadline, retry, **kwargs)
+        replayable = isinstance(kwargs.get("data"), (bytes, type(None)))
+        if replayable and body is not None and is_locked_body(response.status, body):
+            logger.debug("Vault is locked; unlocking to replay %s %s", method, url)
+            await manager.unlock(self, seen)
+            response, body = await self._retrying(
+                method, url, deadline, retry, **kwargs
+            )
+        return response, body
+
+    async def _retrying(
+        self,
+        method: str,
+        url: str,
+        deadline: Optional[float],
+        retry: Optional[RetryPolicy],
+        **kwargs,
+    ) -> Tuple[aiohttp.ClientResponse, Optional[bytes]]:
+        url = self._url(url)
+        budget = self._deadline(deadline)
+        retry = retry or self.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response, body = await self._attempt(method, url, budget, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if isinstance(e, asyncio.TimeoutError) and self.metrics is not None:
+                    self.metrics.observe_timeout(method, url)
+                delay = retry.delay(attempt - 1)
+                if not retry.should_retry(method, attempt, budget, delay):
+                    raise
+            else:
+                # bodies are decoded by the caller: proxies and an overloaded
+                # server answer retryable statuses with non-JSON bodies
+                if response.status not in retry.statuses:
+                    return response, body
+                delay = retry.delay(attempt - 1)
+                if not retry.should_retry(method, attempt, budget, delay):
+                    return response, body
+            logger.debug("Retrying %s %s in %.3fs", method, url, delay)
+            if self.metrics is not None:
+                self.metrics.observe_retry(method, url)
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        method: str,
+        url: str,
+        budget: Optional[Deadline],
+        stream: bool = False,
+        **kwargs,
+    ) -> Tuple[aiohttp.ClientResponse, Optional[bytes]]:
+        """Make one request and read its body. With `stream`, a 200 response
+        is returned unread instead (with `None` for the body) and must be
+        released by the caller; the concurrency slot is only held until its
+        headers have arrived."""
+        session = await self._get_session()
+        async with self._semaphore:
+            kwargs["timeout"] = self._client_timeout(budget)
+            start = time.perf_counter()
+            try:
+                response = await session.request(method, url, **kwargs)
+                body = None
+                if not stream or response.status != 200:
+                    try:
+                        body = await response.read()
+                    finally:
+                        response.release()
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                logger.debug("%s %s failed after %.3fs: %r", method, url, elapsed, e)
+                if self.metrics is not None:
+                    self.metrics.observe_request(
+                        method, url, None, elapsed, error=type(e).__name__
+                    )
+                raise
+            finally:
+                if method != "GET" and self.singleflight is not None:
+                    self.singleflight.forget()  # later reads must see this write
+        elapsed = time.perf_counter() - start
+        logger.debug("%s %s -> %s in %.3fs", method, url, response.status, elapsed)
+        if self.metrics is not None:
+            if body is None:
+                size = int(response.headers.get("Content-Length") or 0)
+            else:
+                size = len(body)
+            self.metrics.observe_request(method, url, response.status, elapsed, size)
+        return response, body
+
+    async def _stream(self, url: str, headers: dict = None) -> aiohttp.ClientResponse:
+        """GET `url` for reading as a stream; raises the server's error for
+        any status but 200."""
+        response, body = await self._exchange(
+            "GET", url, None, None, stream=True, headers=headers
+        )
+        if body is not None:
+            raise Exception(_error_message(body, response.reason))
+        return response
+
+    async def _request_file(
+        self,
+        method: str,
+        url: str,
+        file: Union[str, BinaryIO],
+        headers=None,
+        deadline: float = None,
+        filename: str = None,
+    ) -> aiohttp.ClientResponse:
+        """Upload `file` as a multipart body streamed in chunks. The body
+        cannot be sent twice, so uploads are neither retried nor replayed."""
+        with open_upload(file) as f:
+            data = aiohttp.FormData()
+            data.add_field("file", f, filename=filename or upload_name(file))
+            response, _ = await self._exchange(
+                method, url, deadline, NO_RETRY, data=data, headers=headers
+            )
+            return response
+
+    # HTTP methods
+    async def get(self, url: str, headers=None, deadline: float = None) -> dict:
+        def fetch():
+            return self._request("GET", url, deadline, headers=headers)
+
+        if self.singleflight is None or headers is not None:
+            return await fetch()
+        return await self._coalesce(("GET", url), fetch, deadline)
+
+    async def post(
+        self, url: str, data: dict = None, headers=None, deadline: float = None
+    ) -> dict:
+        return await self._send("POST", url, data, headers, deadline)
+
+    async def post_file(
+        self,
+        url: str,
+        file: Union[str, BinaryIO],
+        headers=None,
+        deadline: float = None,
+        filename: str = None,
+    ) -> aiohttp.ClientResponse:
+        return await self._request_file("POST", url, file, headers, deadline, filename)
+
+    async def put(
+        self, url: str, data: dict, headers=None, deadline: float = None
+    ) -> dict:
+        return await self._send("PUT", url, data, headers, deadline)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Union[dict, bytes, None],
+        headers: Optional[dict],
+        deadline: Optional[float],
+        retry: RetryPolicy = None,
+    ) -> dict:
+        if data is not None:
+            headers = {"Content-Type": JSON_CONTENT_TYPE, **(headers or {})}
+            if not isinstance(data, bytes):
+                data = dumps(data)
+        return await self._request(
+            method, url, deadline, retry, data=data, headers=headers
+        )
+
+    async def put_file(
+        self,
+        url: str,
+        file: Union[str, BinaryIO],
+        headers=None,
+        deadline: float = None,
+        filename: str = None,
+    ) -> aiohttp.ClientResponse:
+        return await self._request_file("PUT", url, file, headers, deadline, filename)
+
+    async def delete(self, url: str, headers=None, deadline: float = None) -> dict:
+        return await self._request("DELETE", url, deadline, headers=headers)
+
+    async def _coalesce(
+        self, key: tuple, fetch: Callable[[], Awaitable], deadline=None
+    ) -> Any:
+        budget = self._deadline(deadline)
+        timeout = budget.remaining() if budget is not None else None
+        return await self.singleflight.do(key, fetch, timeout)
+
+    async def _fetch(self, url: str, decode: Callable[..., Any]) -> Any:
+        """GET `url` and build models from the response with `decode`."""
+
+        async def fetch():
+            return self._decode(decode, await self.get(url))
+
+        if self.singleflight is None:
+            return await fetch()
+        return await self._coalesce(("GET", url, decode), fetch)
+
+    ### Lock & Unlock ###
+    async def lock(self) -> dict:
+        return await self.post("/lock")
+
+    async def unlock(self, password: str) -> dict:
+        return await self.post("/unlock", data={"password": password})
+
+    ### Miscellaneous ###
+    async def sync(self) -> dict:
+        try:
+            return await self.post("/sync")
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+
+    async def status(self) -> dict:
+        return await self.get("/status")
+
+    async def get_generate(self) -> dict:
+        return await self.get("/generate")
+
+    async def get_template(self, template: str) -> dict:
+        return await self.get(f"/object/template/{template}")
+
+    async def get_fingerprint(self) -> dict:
+        return await self.get("/object/fingerprint/me")
+
+    ### Vault Items ###
+    async def get_item(self, _id: str) -> Item:
+        def fetch():
+            return self._fetch(f"/object/item/{_id}", _item_from_response)
+
+        return await self._cached(("item", _id), fetch)
+
+    async def add_item(self, item: Item) -> Item:
+        return self._decode(
+            _item_from_response, await self.post("/object/item", data=item.to_dict())
+        )
+
+    async def edit_item(self, _id: str, item: Item) -> Item:
+        try:
+            return self._decode(
+                _item_from_response,
+                await self.put(f"/object/item/{_id}", data=item.to_dict()),
+            )
+        finally:
+            self._invalidate("item", _id)
+
+    async def delete_item(self, _id: str) -> dict:
+        try:
+            return await self.delete(f"/object/item/{_id}")
+        finally:
+            self._invalidate("item", _id)
+
+    async def restore_item(self, _id: str) -> dict:
+        try:
+            return await self.post(f"/restore/item/{_id}")
+        finally:
+            self._invalidate("item", _id)
+
+    async def get_items(
+        self,
+        lazy: bool = False,
+        search_query: str = None,
+        folder_id: str = None,
+        collection_id: str = None,
+        organization_id: str = None,
+        url: str = None,
+        trash: bool = False,
+    ) -> List[Item]:
+        list_url = _items_url(
+            search_query, folder_id, collection_id, organization_id, url, trash
+        )
+        if lazy:
+            items = await self._fetch(list_url, _lazy_items_from_response)
+        else:
+            items = await self._fetch(list_url, _items_from_response)
+        if list_url == ITEMS_URL:
+            self.vault_size = len(items)
+        return items
+
+    async def iter_items(
+        self,
+        chunk_size: int = 65536,
+        lazy: bool = False,
+        search_query: str = None,
+        folder_id: str = None,
+        collection_id: str = None,
+        organization_id: str = None,
+        url: str = None,
+        trash: bool = False,
+    ) -> AsyncIterator[Item]:
+        decode = LazyItem if lazy else decode_item
+        raw_items = self.iter_raw_items(
+            chunk_size,
+            search_query,
+            folder_id,
+            collection_id,
+            organization_id,
+            url,
+            trash,
+        )
+        async for item in raw_items:
+            yield decode(item)
+
+    async def iter_raw_items(
+        self,
+        chunk_size: int = 65536,
+        search_query: str = None,
+        folder_id: str = None,
+        collection_id: str = None,
+        organization_id: str = None,
+        url: str = None,
+        trash: bool = False,
+    ) -> AsyncIterator[dict]:
+        list_url = _items_url(
+            search_query, folder_id, collection_id, organization_id, url, trash
+        )
+        count = 0
+        response = await self._stream(list_url)
+        try:
+            stream = JsonArrayStream(("data", "data"))
+            async for chunk in response.content.iter_chunked(chunk_size):
+                for raw in _feed_list(stream, chunk):
+                    count += 1
+                    yield raw
+            for raw in _feed_list(stream, None):
+                count += 1
+                yield raw
+        finally:
+            response.release()
+        if list_url == ITEMS_URL:
+            self.vault_size = count
+
+    ### Attachments & Fields ###
+    async def add_attachment(
+        self, _id: str, file: Union[str, BinaryIO], filename: str = None
+    ) -> aiohttp.ClientResponse:
+        try:
+            return await self.post_file(
+                f"/object/attachment?itemid={_id}", file, filename=filename
+            )
+        finally:
+            self._invalidate("item", _id)
+
+    async def get_attachment(self, _id: str, attachmentId: str) -> bytes:
+        buffer = io.BytesIO()
+        await self.download_attachment(_id, attachmentId, buffer)
+        return buffer.getvalue()
+
+    async def download_attachment(
+        self,
+        _id: str,
+        attachmentId: str,
+        dest: Union[str, os.PathLike, BinaryIO],
+        chunk_size: int = 65536,
+    ) -> int:
+        """Like `VaultClient.download_attachment`; chunks are written to
+        `dest` from the event loop."""
+        response = await self._stream(
+            f"/object/attachment/{attachmentId}?itemid={_id}", {"Accept": "*/*"}
+        )
+        try:
+            written = 0
+            with _open_download(dest) as f:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+            return written
+        finally:
+            response.release()
+
+    async def add_attachments(
+        self, uploads: Iterable[Tuple[str, Union[str, BinaryIO]]]
+    ) -> BulkReport:
+        return await _gather_bulk(lambda u: self.add_attachment(*u), uploads)
+
+    async def download_attachments(
+        self, downloads: Iterable[Tuple[str, str, Union[str, os.PathLike, BinaryIO]]]
+    ) -> BulkReport:
+        return await _gather_bulk(lambda d: self.download_attachment(*d), downloads)
+
+    async def delete_attachment(self, _id: str, attachmentId: str) -> dict:
+        try:
+            return await self.delete(f"/object/attachment/{attachmentId}?itemid={_id}")
+        finally:
+            self._invalidate("item", _id)
+
+    async def get_username(self, _id: str, onlyValue: bool = False) -> Union[dict, str]:
+        return _value_from_response(
+            await self.get(f"/object/username/{_id}"), onlyValue
+        )
+
+    async def get_password(self, _id: str, onlyValue: bool = False) -> Union[dict, str]:
+        return _value_from_response(
+            await self.get(f"/object/password/{_id}"), onlyValue
+        )
+
+    async def get_totp(self, _id: str, onlyValue: bool = False) -> Union[dict, str]:
+        return _value_or_message(await self.get(f"/object/totp/{_id}"), onlyValue)
+
+    async def get_notes(self, _id: str, onlyValue: bool = False) -> Union[dict, str]:
+        return _value_or_message(await self.get(f"/object/notes/{_id}"), onlyValue)
+
+    async def get_exposed(self, _id: str, onlyValue: bool = False) -> Union[dict, str]:
+        return _value_from_response(await self.get(f"/object/exposed/{_id}"), onlyValue)
+
+    async def get_usernames(
+        self, ids: Iterable[str], from_list: bool = None
+    ) -> BatchResult:
+        return await self._lookup_login("username", ids, from_list)
+
+    async def get_passwords(
+        self, ids: Iterable[str], from_list: bool = None
+    ) -> BatchResult:
+        """Like `VaultClient.get_passwords`; concurrency is bounded by the
+        client's `max_concurrency`."""
+        return await self._lookup_login("password", ids, from_list)
+
+    async def get_totps(self, ids: Iterable[str]) -> BatchResult:
+        return await self._lookup("totp", list(dict.fromkeys(ids)))
+
+    async def _lookup(self, kind: str, ids: List[str]) -> BatchResult:
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(self.get(f"/object/{kind}/{_id}") for _id in ids),
+            return_exceptions=True,
+        )
+        return _batch_result(ids, outcomes, time.perf_counter() - start)
+
+    async def _lookup_login(
+        self, key: str, ids: Iterable[str], from_list: bool
+    ) -> BatchResult:
+        ids = list(dict.fromkeys(ids))
+        if from_list is None:
+            from_list = _use_list(ids, self.vault_size)
+        if not from_list:
+            return await self._lookup(key, ids)
+        start = time.perf_counter()
+        result = BatchResult()
+        try:
+            wanted, values = set(ids), {}
+            async for raw in self.iter_raw_items():
+                if raw.get("id") in wanted:
+                    values[raw["id"]] = raw
+            result.values = _login_values(values.values(), key, ids)
+        except Exception as e:
+            result.failed = dict.fromkeys(ids, e)
+        else:
+            result.missing = [_id for _id in ids if _id not in result.values]
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    ### Folders ###
+    async def add_folder(self, name: str) -> Folder:
+        return self._decode(
+            _folder_from_response,
+            await self.post("/object/folder", data={"name": name}),
+        )
+
+    async def edit_folder(self, _id: str, name: str) -> Folder:
+        try:
+            return self._decode(
+                _folder_from_response,
+                await self.put(f"/object/folder/{_id}", data={"name": name}),
+            )
+        finally:
+            self._invalidate("folder", _id)
+
+    async def get_folder(self, _id: str) -> Folder:
+        def fetch():
+            return self._fetch(f"/object/folder/{_id}", _folder_from_response)
+
+        return await self._cached(("folder", _id), fetch)
+
+    async def delete_folder(self, _id: str) -> dict:
+        try:
+            return await self.delete(f"/object/folder/{_id}")
+        finally:
+            self._invalidate("folder", _id)
+
+    async def get_folders(self) -> List[Folder]:
+        return await self._fetch("/list/object/folders", _folders_from_response)
+
+    ### Sends ###
+    async def add_send(self, send: Send) -> Send:
+        return self._decode(
+            _send_from_response, await self.post("/object/send", data=send.to_dict())
+        )
+
+    async def edit_send(self, _id: str, send: Send) -> Send:
+        try:
+            return self._decode(
+                _send_from_response,
+                await self.put(f"/object/send/{_id}", data=send.to_dict()),
+            )
+        finally:
+            self._invalidate("send", _id)
+
+    async def get_send(self, _id: str) -> Send:
+        def fetch():
+            return self._fetch(f"/object/send/{_id}", _send_from_response)
+
+        return await self._cached(("send", _id), fetch)
+
+    async def delete_send(self, _id: str) -> dict:
+        try:
+            return await self.delete(f"/object/send/{_id}")
+        finally:
+            self._invalidate("send", _id)
+
+    async def get_sends(self) -> List[Send]:
+        return await self._fetch("/list/object/send", _sends_from_response)
+
+    async def remove_password(self, _id: str) -> dict:
+        try:
+            return await self.post(f"/send/{_id}/remove-password")
+        finally:
+            self._invalidate("send", _id)
+
+    ### Collections & Organizations ###
+    async def move_item(
+        self, item_id: str, org_id: str, collections: List[str]
+    ) -> dict:
+        try:
+            return await self.post(
+                f"/move/{item_id}/{org_id}",
+                data={"collections": collections},
+            )
+        finally:
+            self._invalidate("item", item_id)
+
+    async def move_items(
+        self,
+        items: Iterable[Union[str, Item]],
+        org_id: str,
+        collections: List[str],
+        retry: RetryPolicy = None,
+        sync: bool = False,
+    ) -> BulkReport:
+        """`VaultClient.move_items`; concurrency is bounded by the client."""
+        if retry is None:
+            retry = replace(self.retry, methods=self.retry.methods | {"POST"})
+        data = dumps({"collections": collections})
+
+        async def move(x):
+            item_id = x if isinstance(x, str) else x.id
+            try:
+                response = await self._send(
+                    "POST", f"/move/{item_id}/{org_id}", data, None, None, retry
+                )
+            finally:
+                self._invalidate("item", item_id)
+            if not response.get("success", True):
+                raise Exception(response.get("message", "Error moving item"))
+            return response
+
+        report = await _gather_bulk(move, items)
+        if sync:
+            await self.sync()
+        return report
+
+    async def add_org_collection(
+        self, org_id: str, collection: Collection
+    ) -> Collection:
+        response = await self.post(
+            f"/object/org-collection?organizationId={org_id}",
+            data=collection.to_dict(),
+        )
+        return self._decode(_collection_from_response, response)
+
+    async def edit_org_collection(
+        self, org_id: str, collection_id: str, collection: Collection
+    ) -> Collection:
+        try:
+            response = await self.put(
+                f"/object/org-collection/{collection_id}?organizationId={org_id}",
+                data=collection.to_dict(),
+            )
+            return self._decode(_collection_from_response, response)
+        finally:
+            self._invalidate("org-collection", org_id, collection_id)
+
+    async def get_org_collection(self, org_id: str, collection_id: str) -> Collection:
+        def fetch():
+            return self._fetch(
+                f"/object/org-collection/{collection_id}?organizationId={org_id}",
+                _collection_from_response,
+            )
+
+        return await self._cached(("org-collection", org_id, collection_id), fetch)
+
+    async def delete_org_collection(self, org_id: str, collection_id: str) -> dict:
+        try:
+            return await self.delete(
+                f"/object/org-collection/{collection_id}?organizationId={org_id}"
+            )
+        finally:
+            self._invalidate("org-collection", org_id, collection_id)
+
+    async def get_org_collections(self, org_id: str) -> List[Collection]:
+        return await self._fetch(
+            f"/list/object/org-collections?organizationId={org_id}",
+            _collections_from_response,
+        )
+
+    async def get_collections(self, search_query: str = None) -> List[Collection]:
+        url = _list_url("/list/object/collections", search=search_query or None)
+        return await self._fetch(url, _collections_from_response)
+
+    async def get_organizations(self, search_query: str = None) -> list:
+        url = _list_url("/list/object/organizations", search=search_query or None)
+        return await self._fetch(url, _organizations_from_response)
+
+    async def get_org_members(self, org_id: str) -> List[OrgMember]:
+        return await self._fetch(
+            f"/list/object/org-members/{org_id}", _org_members_from_response
+        )
+
+    async def confirm_org_member(self, org_id: str, member_id: str) -> dict:
+        return await self.post(
+            f"/confirm/org-member/{member_id}?organizationId={org_id}"
+        )
+
+    async def confirm_org_members(
+        self, org_id: str, members: Iterable[Union[str, OrgMember]]
+    ) -> BulkReport:
+        """Confirm members, given as ids or `OrgMember`s, concurrently."""
+
+        async def confirm(x):
+            member_id = x if isinstance(x, str) else x.id
+            response = await self.confirm_org_member(org_id, member_id)
+            if not response.get("success", True):
+                raise Exception(response.get("message", "Error confirming member"))
+            return response
+
+        return await _gather_bulk(confirm, members)
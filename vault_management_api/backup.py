@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Whole-vault export and import as JSON Lines.
+
+`export_vault` writes one JSON object per line: a header, then the folders,
+collections, items and sends exactly as `bw serve` returns them. Items are
+streamed from the list response, so memory does not grow with the vault;
+the output is gzip-compressed if `compress` is set or the path ends in
+`.gz`. `import_vault` reads such a file line by line and creates the
+folders, items and sends in concurrent batches, pointing items at the new
+ids of their folders. Collections belong to organizations and are not
+recreated on import; attachments are not part of the export.
+"""
+
+import gzip
+import os
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+from .bulk import BulkFailure, run_bulk
+from .jsonlib import dumps, loads
+from .vault_management_api import (
+    DECODERS,
+    Send,
+    VaultClient,
+    _open_download,
+    decode_item,
+    get_default_client,
+)
+
+FORMAT = "vault-jsonl"
+VERSION = 1
+
+# Listing endpoint of each exported object type, in export order
+_LISTS = (
+    ("folder", "/list/object/folders"),
+    ("collection", "/list/object/collections"),
+    ("item", None),  # streamed with iter_raw_items
+    ("send", "/list/object/send"),
+)
+
+
+@dataclass
+class TransferReport:
+    """Progress and outcome of an export or import.
+
+    `counts` holds the objects written (export) or created (import) per
+    object type. `bytes` is the uncompressed size of the stream so far.
+    """
+
+    counts: Dict[str, int] = field(default_factory=dict)
+    failures: List[BulkFailure] = field(default_factory=list)
+    skipped: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def throughput(self) -> float:
+        """Objects per second."""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+def _compressed(path: Union[str, os.PathLike, BinaryIO], compress: Optional[bool]):
+    if compress is not None:
+        return compress
+    return isinstance(path, (str, os.PathLike)) and os.fspath(path).endswith(".gz")
+
+
+def _objects(client: VaultClient) -> Iterator[Dict[str, Any]]:
+    for _, url in _LISTS:
+        if url is None:
+            yield from client.iter_raw_items()
+        else:
+            yield from client.get(url)["data"]["data"]
+
+
+def export_vault(
+    path: Union[str, os.PathLike, BinaryIO],
+    client: VaultClient = None,
+    compress: bool = None,
+    progress: Callable[[TransferReport], None] = None,
+    progress_every: int = 1000,
+) -> TransferReport:
+    """Write the vault to `path` (a path or a binary file). A path is only
+    replaced once the export is complete. `progress` is called with the
+    running report every `progress_every` objects and at the end."""
+    client = client or get_default_client()
+    report = TransferReport()
+    start = time.perf_counter()
+    with _open_download(path) as f, ExitStack() as stack:
+        out = f
+        if _compressed(path, compress):
+            out = stack.enter_context(gzip.GzipFile(fileobj=f, mode="wb"))
+        header = dumps({"object": FORMAT, "version": VERSION}) + b"\n"
+        out.write(header)
+        report.bytes += len(header)
+        for obj in _objects(client):
+            line = dumps(obj) + b"\n"
+            out.write(line)
+            kind = obj.get("object")
+            report.counts[kind] = report.counts.get(kind, 0) + 1
+            report.bytes += len(line)
+            if progress is not None and report.total % progress_every == 0:
+                report.elapsed = time.perf_counter() - start
+                progress(report)
+    report.elapsed = time.perf_counter() - start
+    if progress is not None:
+        progress(report)
+    return report
+
+
+def _open_export(
+    path: Union[str, os.PathLike, BinaryIO], compress: Optional[bool], stack: ExitStack
+) -> BinaryIO:
+    """Open `path` for reading, decompressing it if `compress` or, when
+    that is None, if it starts with the gzip magic number."""
+    if isinstance(path, (str, os.PathLike)):
+        f = stack.enter_context(open(path, "rb"))
+    else:
+        f = path
+    if compress is None:
+        if f.seekable():
+            position = f.tell()
+            compress = f.read(2) == b"\x1f\x8b"
+            f.seek(position)
+        else:
+            compress = False
+    if compress:
+        return stack.enter_context(gzip.GzipFile(fileobj=f, mode="rb"))
+    return f
+
+
+class _Importer:
+    def __init__(self, client: VaultClient, max_workers: int):
+        self.client = client
+        self.max_workers = max_workers
+        self.folder_ids: Dict[str, str] = {}
+
+    def create_folder(self, raw: dict):
+        return self.client.add_folder(raw["name"])
+
+    def create_item(self, raw: dict):
+        item = decode_item(raw)
+        item.id = None
+        item.folderId = self.folder_ids.get(item.folderId)
+        return self.client.add_item(item)
+
+    def create_send(self, raw: dict):
+        send: Send = DECODERS[Send](raw)
+        return self.client.add_send(send)
+
+    def flush(self, kind: str, batch: List[tuple], report: TransferReport) -> None:
+        create = getattr(self, f"create_{kind}")
+        result = run_bulk(create, [raw for _, raw in batch], self.max_workers)
+        for failure in result.failures:
+            line, raw = batch[failure.index]
+            report.failures.append(BulkFailure(line, raw, failure.error))
+        if kind == "folder":
+            for (_, raw), folder in zip(batch, result.results):
+                if folder is not None:
+                    self.folder_ids[raw.get("id")] = folder.id
+        report.counts[kind] = report.counts.get(kind, 0) + result.succeeded
+
+
+def import_vault(
+    path: Union[str, os.PathLike, BinaryIO],
+    client: VaultClient = None,
+    compress: bool = None,
+    batch_size: int = 100,
+    max_workers: int = None,
+    progress: Callable[[TransferReport], None] = None,
+) -> TransferReport:
+    """Create the objects of an `export_vault` file in `client`'s vault.
+
+    Objects are created `batch_size` at a time over `max_workers` threads
+    (default: the client's pool size). Failures are recorded in the report
+    with their line number instead of aborting the import. `progress` is
+    called with the running report after every batch.
+    """
+    client = client or get_default_client()
+    importer = _Importer(client, max_workers or client.pool_maxsize)
+    report = TransferReport()
+    start = time.perf_counter()
+    kind, batch = None, []
+
+    def flush():
+        importer.flush(kind, batch, report)
+        batch.clear()
+        if progress is not None:
+            report.elapsed = time.perf_counter() - start
+            progress(report)
+
+    with ExitStack() as stack:
+        for number, line in enumerate(_open_export(path, compress, stack), 1):
+            report.bytes += len(line)
+            if not line.strip():
+                continue
+            obj = loads(line)
+            if number == 1:
+                if obj.get("object") != FORMAT or obj.get("version") != VERSION:
+                    raise Exception("Not a vault export")
+                continue
+            if obj.get("object") not in ("folder", "item", "send"):
+                report.skipped += 1
+                continue
+            if batch and (obj["object"] != kind or len(batch) >= batch_size):
+                flush()
+            kind = obj["object"]
+            batch.append((number, obj))
+        if batch:
+            flush()
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+
+@dataclass
+class BulkFailure:
+    index: int
+    input: Any
+    error: BaseException
+
+
+@dataclass
+class BulkReport:
+    """Outcome of a bulk operation.
+
+    `results` is in input order; entries whose call failed are `None` and have
+    a matching `BulkFailure` in `failures`.
+    """
+
+    results: List[Any] = field(default_factory=list)
+    failures: List[BulkFailure] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return len(self.results) - len(self.failures)
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    @property
+    def throughput(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class BatchResult:
+    """Outcome of looking up one value for each of many ids.
+
+    `values` maps the ids that resolved to their value, `missing` lists the
+    ids without a value and `failed` maps ids whose lookup raised to the
+    exception.
+    """
+
+    values: Dict[str, Any] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    failed: Dict[str, BaseException] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.failed
+
+
+def run_bulk(
+    fn: Callable[[Any], Any], inputs: Iterable[Any], max_workers: int = 8
+) -> BulkReport:
+    """Call `fn` on every input over a pool of `max_workers` threads.
+
+    At most `max_workers * 2` calls are queued at a time, so `inputs` may be a
+    lazy iterable of any length. Exceptions are recorded per input instead of
+    aborting the batch. Each call runs in a copy of the caller's context, so
+    an enclosing `with deadline(...)` block also bounds the calls.
+    """
+    report = BulkReport()
+    start = time.perf_counter()
+    pending = {}
+
+    def collect(done) -> None:
+        for future in done:
+            index, value = pending.pop(future)
+            try:
+                report.results[index] = future.result()
+            except Exception as e:
+                report.failures.append(BulkFailure(index, value, e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index, value in enumerate(inputs):
+            report.results.append(None)
+            context = contextvars.copy_context()
+            pending[executor.submit(context.run, fn, value)] = (index, value)
+            if len(pending) >= max_workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+
+    report.failures.sort(key=lambda failure: failure.index)
+    report.elapsed = time.perf_counter() - start
+    return report
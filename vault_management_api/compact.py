@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Memory-compact variants of the vault models.
+
+`CompactItem` and friends have the same fields as `Item`, `Login`, ... but
+are slotted dataclasses, so instances carry no per-object `__dict__`. Their
+decoders intern the strings that repeat across a vault (organization,
+folder and collection ids, revision dates, field names and the `object`
+tag); URI match types are already shared `MatchType` members. `to_dict` and
+`to_json` go through the regular model, so they produce identical output.
+"""
+
+from dataclasses import MISSING, field, fields, make_dataclass
+from typing import Any, Dict
+
+from .decoders import (
+    INTERN,
+    OPT_INTERN_LIST,
+    OPT_LIST,
+    OPT_NESTED,
+    OPT_STR_LIST,
+    RAW,
+    compile_decoders,
+)
+from .vault_management_api import (
+    DECODER_SPECS,
+    Card,
+    Field,
+    Identity,
+    Item,
+    Login,
+    SecureNote,
+    Send,
+    SendText,
+    Uri,
+)
+
+_INTERNED = {
+    Item: {"organizationId", "folderId", "object", "collectionIds", "revisionDate"},
+    Field: {"name"},
+}
+
+_MODELS = (Uri, Login, SecureNote, Card, Identity, Field, Item, SendText, Send)
+_COMPACT: Dict[type, type] = {}
+
+
+def _to_model(value: Any) -> Any:
+    if type(value) in _MODEL_OF:
+        return value.to_model()
+    if isinstance(value, list):
+        return [_to_model(v) for v in value]
+    return value
+
+
+def _from_model(value: Any) -> Any:
+    if type(value) in _COMPACT:
+        return _COMPACT[type(value)].from_model(value)
+    if isinstance(value, list):
+        return [_from_model(v) for v in value]
+    return value
+
+
+def _compact_class(model: type) -> type:
+    names = [f.name for f in fields(model)]
+
+    def to_model(self):
+        return model(*(_to_model(getattr(self, name)) for name in names))
+
+    def from_model(cls, obj):
+        return cls(*(_from_model(getattr(obj, name)) for name in names))
+
+    def to_dict(self) -> dict:
+        return self.to_model().to_dict()
+
+    def to_json(self) -> str:
+        return self.to_model().to_json()
+
+    return make_dataclass(
+        f"Compact{model.__name__}",
+        [
+            (
+                (f.name, f.type, field(default=f.default))
+                if f.default is not MISSING
+                else (f.name, f.type)
+            )
+            for f in fields(model)
+        ],
+        namespace={
+            "to_model": to_model,
+            "from_model": classmethod(from_model),
+            "to_dict": to_dict,
+            "to_json": to_json,
+        },
+        slots=True,
+    )
+
+
+def _compact_spec(model: type) -> list:
+    spec = []
+    for attribute, key, kind, arg in DECODER_SPECS[model]:
+        if kind in (OPT_NESTED, OPT_LIST):
+            arg = _COMPACT[arg]
+        elif attribute in _INTERNED.get(model, ()):
+            kind = {RAW: INTERN, OPT_STR_LIST: OPT_INTERN_LIST}[kind]
+        spec.append((attribute, key, kind, arg))
+    return spec
+
+
+for _model in _MODELS:
+    _COMPACT[_model] = _compact_class(_model)
+_MODEL_OF = {compact: model for model, compact in _COMPACT.items()}
+
+CompactUri = _COMPACT[Uri]
+CompactLogin = _COMPACT[Login]
+CompactSecureNote = _COMPACT[SecureNote]
+CompactCard = _COMPACT[Card]
+CompactIdentity = _COMPACT[Identity]
+CompactField = _COMPACT[Field]
+CompactItem = _COMPACT[Item]
+CompactSendText = _COMPACT[SendText]
+CompactSend = _COMPACT[Send]
+
+COMPACT_DECODERS = compile_decoders(
+    {_COMPACT[model]: _compact_spec(model) for model in _MODELS}
+)
+decode_compact_item = COMPACT_DECODERS[CompactItem]
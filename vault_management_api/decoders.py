@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Code generation for model decoders.
+
+`compile_decoders` turns a declarative field spec per model class into one
+plain Python function per class. The generated functions produce the same
+objects as the hand-written `from_dict` methods, but read each field with a
+single `dict.get` and a type check instead of trying converters inside
+`try/except` through `from_union`.
+
+A spec is a list of `(attribute, key, kind, arg)` tuples in the order of the
+dataclass fields, where `kind` is one of:
+
+    RAW              the value as-is
+    OPT_INT          the value if it is an int (not a bool), else None
+    ENUM             `arg(value)`, raising on unknown values
+    OPT_ENUM         the `arg` member for the value, else None
+    OPT_NESTED       the decoded `arg` model if the value decodes, else None
+    OPT_LIST         a list of decoded `arg` models if all decode, else None
+    OPT_STR_LIST     a copy of the value if it is a list, else None
+    INTERN           like RAW, but strings are passed through `sys.intern`
+    OPT_INTERN_LIST  like OPT_STR_LIST, with the strings interned
+    EXPR             the Python expression `arg`, evaluated with `v` bound
+    CALL             `arg(value)`
+"""
+
+import sys
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+RAW = "raw"
+OPT_INT = "opt_int"
+ENUM = "enum"
+OPT_ENUM = "opt_enum"
+OPT_NESTED = "opt_nested"
+OPT_LIST = "opt_list"
+OPT_STR_LIST = "opt_str_list"
+INTERN = "intern"
+OPT_INTERN_LIST = "opt_intern_list"
+EXPR = "expr"
+CALL = "call"
+
+Spec = List[Tuple[str, str, str, Any]]
+
+
+def _enum_lookup(enum) -> dict:
+    lookup = dict(enum._value2member_map_)
+    lookup.update({member: member for member in enum})
+    return lookup
+
+
+def _field_source(n: int, key: str, kind: str, arg: Any, namespace: dict) -> List[str]:
+    v = f"v{n}"
+    lines = [f"{v} = get({key!r})"]
+    if kind == RAW:
+        pass
+    elif kind == OPT_INT:
+        lines.append(
+            f"if not isinstance({v}, int) or isinstance({v}, bool): {v} = None"
+        )
+    elif kind in (ENUM, OPT_ENUM):
+        namespace[f"_lookup{n}"] = _enum_lookup(arg)
+        namespace[f"_enum{n}"] = arg
+        lookup = f"(_lookup{n}.get({v}) if {v}.__hash__ else None)"
+        if kind == ENUM:
+            lines.append(f"{v} = {lookup} or _enum{n}({v})")
+        else:
+            lines.append(f"{v} = {lookup}")
+    elif kind in (OPT_NESTED, OPT_LIST):
+        namespace[f"_decode{n}"] = arg
+        if kind == OPT_NESTED:
+            check, decode = "dict", f"_decode{n}({v})"
+        else:
+            check, decode = "list", f"[_decode{n}(y) for y in {v}]"
+        lines += [
+            f"if isinstance({v}, {check}):",
+            "    try:",
+            f"        {v} = {decode}",
+            "    except Exception:",
+            f"        {v} = None",
+            "else:",
+            f"    {v} = None",
+        ]
+    elif kind == OPT_STR_LIST:
+        lines.append(f"{v} = list({v}) if isinstance({v}, list) else None")
+    elif kind == INTERN:
+        lines.append(f"if {v}.__class__ is str: {v} = _intern({v})")
+    elif kind == OPT_INTERN_LIST:
+        lines.append(
+            f"{v} = [_intern(y) if y.__class__ is str else y for y in {v}]"
+            f" if isinstance({v}, list) else None"
+        )
+    elif kind == EXPR:
+        lines.append(f"v = {v}")
+        lines.append(f"{v} = {arg}")
+    elif kind == CALL:
+        namespace[f"_call{n}"] = arg
+        lines.append(f"{v} = _call{n}({v})")
+    else:
+        raise ValueError(f"Unknown field kind {kind!r}")
+    return lines
+
+
+def compile_decoder(
+    cls: type, spec: Spec, decoders: Dict[type, Callable], check_dict: bool = True
+) -> Callable[[dict], Any]:
+    """Generate the decode function for `cls`. Nested model classes named in
+    `spec` must already have a decoder in `decoders`. With `cls=dict` the
+    function returns a dict of attribute name to decoded value instead."""
+    if is_dataclass(cls):
+        expected = [f.name for f in fields(cls)]
+        if [attribute for attribute, *_ in spec] != expected:
+            raise ValueError(f"Spec for {cls.__name__} does not match its fields")
+    namespace = {"_cls": cls, "_intern": sys.intern}
+    body = ["assert isinstance(obj, dict)"] if check_dict else []
+    body.append("get = obj.get")
+    for n, (_, key, kind, arg) in enumerate(spec):
+        if kind in (OPT_NESTED, OPT_LIST):
+            arg = decoders[arg]
+        body += _field_source(n, key, kind, arg, namespace)
+    if cls is dict:
+        items = ", ".join(
+            f"{attribute!r}: v{n}" for n, (attribute, *_) in enumerate(spec)
+        )
+        body.append(f"return {{{items}}}")
+    else:
+        body.append(f"return _cls({', '.join(f'v{n}' for n in range(len(spec)))})")
+    name = f"decode_{cls.__name__}"
+    source = f"def {name}(obj):\n" + "".join(f"    {line}\n" for line in body)
+    exec(compile(source, f"<decoder {cls.__name__}>", "exec"), namespace)
+    decoder = namespace[name]
+    decoder.__source__ = source
+    return decoder
+
+
+def compile_decoders(
+    specs: Dict[type, Spec], check_dict: Dict[type, bool] = None
+) -> Dict[type, Callable[[dict], Any]]:
+    """Compile `specs` in order; nested classes must come before their users."""
+    decoders = {}
+    for cls, spec in specs.items():
+        check = (check_dict or {}).get(cls, True)
+        decoders[cls] = compile_decoder(cls, spec, decoders, check)
+    return decoders
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""JSON backend used for request bodies, responses and `Item.to_json`.
+
+`orjson` is used when it is installed, the standard library otherwise;
+`set_backend` switches explicitly. Bodies are encoded once, compactly and
+as UTF-8 bytes, which the clients hand to the transport as they are (and
+resend unchanged on retries). `orjson` encodes `Enum` members and
+`datetime`s natively; the standard library backend falls back to a
+`default` hook for them.
+"""
+
+import datetime
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    name: str
+    dumps: Callable[[Any], bytes]
+    dumps_pretty: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_compact = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+_pretty = json.JSONEncoder(indent=2, ensure_ascii=False, default=_default)
+
+STDLIB = JsonBackend(
+    "json",
+    lambda obj: _compact.encode(obj).encode(),
+    lambda obj: _pretty.encode(obj).encode(),
+    json.loads,
+)
+
+ORJSON: Optional[JsonBackend] = None
+if orjson is not None:
+    ORJSON = JsonBackend(
+        "orjson",
+        orjson.dumps,
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2),
+        orjson.loads,
+    )
+
+_backend = ORJSON or STDLIB
+
+
+def get_backend() -> JsonBackend:
+    return _backend
+
+
+def set_backend(backend: JsonBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 encoding of `obj`."""
+    return _backend.dumps(obj)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Encoding of `obj` indented by two spaces."""
+    return _backend.dumps_pretty(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _backend.loads(data)
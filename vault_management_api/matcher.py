@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Find the login items that apply to a URL, honouring each URI's `match`.
+
+`UriMatcher` indexes the login URIs of a set of items once, with one
+structure per match type:
+
+    DOMAIN              a trie over reversed domain labels; a URI matches
+                        every URL on the same registrable domain
+    HOST                a dict keyed by `host[:port]`
+    EXACT               a dict keyed by the URI string
+    STARTS_WITH         a sorted list of URI strings, searched for the ones
+                        that prefix the URL
+    REGULAR_EXPRESSION  precompiled case-insensitive patterns
+    NEVER               not indexed
+
+so `match_url` does work in the number of matching URIs (plus one search
+per regular expression) rather than in the size of the vault. URIs without
+a `match` use `default`, `DOMAIN` as in Bitwarden's default setting.
+
+Registrable domains are approximated without the public suffix list: the
+last two labels, or three when the second to last is a common second-level
+label under a country code (`example.co.uk`).
+"""
+
+import ipaddress
+import re
+from bisect import bisect_right
+from os.path import commonprefix
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .vault_management_api import Item, MatchType
+
+_SECOND_LEVEL = frozenset(["ac", "co", "com", "edu", "gov", "net", "org"])
+
+
+def split_host(uri: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """Lower-cased hostname and port of a URI, tolerating a missing scheme."""
+    if not uri:
+        return None, None
+    if "://" not in uri:
+        uri = f"//{uri}"
+    try:
+        parts = urlsplit(uri)
+        return parts.hostname, parts.port
+    except ValueError:
+        return None, None
+
+
+def base_domain(host: str) -> str:
+    """Approximate registrable domain of `host`; IP addresses and single
+    labels are returned as they are."""
+    host = host.rstrip(".")
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _host_key(host: str, port: Optional[int]) -> str:
+    return host if port is None else f"{host}:{port}"
+
+
+class UriMatcher:
+    """Index of login URIs for `match_url` queries.
+
+    Items are kept by reference and matched once per query even if several
+    of their URIs match. The index is not updated when items change; build
+    a new matcher (e.g. after a `VaultMirror.refresh`).
+    """
+
+    def __init__(
+        self, items: Iterable[Item] = (), default: MatchType = MatchType.DOMAIN
+    ):
+        self.default = default
+        self._domains: Dict[str, Any] = {}
+        self._hosts: Dict[str, List[Item]] = {}
+        self._exact: Dict[str, List[Item]] = {}
+        self._prefixes: Dict[str, List[Item]] = {}
+        self._sorted_prefixes: Optional[List[str]] = None
+        self._patterns: List[Tuple["re.Pattern", Item]] = []
+        self.uris = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Item) -> None:
+        login = item.login
+        for uri in (login.uris if login is not None else None) or ():
+            if self._add_uri(item, uri.uri, uri.match or self.default):
+                self.uris += 1
+
+    def _add_uri(self, item: Item, uri: Optional[str], match: MatchType) -> bool:
+        if not uri or match == MatchType.NEVER:
+            return False
+        if match == MatchType.EXACT:
+            self._exact.setdefault(uri, []).append(item)
+        elif match == MatchType.STARTS_WITH:
+            self._prefixes.setdefault(uri, []).append(item)
+            self._sorted_prefixes = None
+        elif match == MatchType.REGULAR_EXPRESSION:
+            try:
+                self._patterns.append((re.compile(uri, re.IGNORECASE), item))
+            except re.error:
+                return False
+        else:
+            host, port = split_host(uri)
+            if host is None:
+                return False
+            if match == MatchType.HOST:
+                self._hosts.setdefault(_host_key(host, port), []).append(item)
+            else:
+                node = self._domains
+                for label in reversed(base_domain(host).split(".")):
+                    node = node.setdefault(label, {})
+                node.setdefault("", []).append(item)
+        return True
+
+    def _starting(self, url: str) -> Iterable[str]:
+        """The STARTS_WITH URIs that are prefixes of `url`, longest first.
+
+        Every prefix of `url` sorts at or before it, and any that sorts
+        before a non-matching key is a prefix of their common prefix, so
+        each step either finds a match or shortens what is searched for.
+        """
+        keys = self._sorted_prefixes
+        if keys is None:
+            keys = self._sorted_prefixes = sorted(self._prefixes)
+        hi = bisect_right(keys, url)
+        while hi:
+            key = keys[hi - 1]
+            if url.startswith(key):
+                yield key
+                bound = key
+            else:
+                bound = commonprefix([key, url])
+                if not bound:
+                    return
+            hi = bisect_right(keys, bound, 0, hi - 1)
+
+    def match_url(self, url: str) -> List[Item]:
+        """Items with a URI that matches `url`, each once."""
+        found: Dict[int, Item] = {}
+
+        def collect(items: Iterable[Item]) -> None:
+            for item in items:
+                found.setdefault(id(item), item)
+
+        collect(self._exact.get(url, ()))
+        for key in self._starting(url):
+            collect(self._prefixes[key])
+        host, port = split_host(url)
+        if host is not None:
+            collect(self._hosts.get(_host_key(host, port), ()))
+            node = self._domains
+            for label in reversed(host.rstrip(".").split(".")):
+                node = node.get(label)
+                if node is None:
+                    break
+                collect(node.get("", ()))
+        for pattern, item in self._patterns:
+            if id(item) not in found and pattern.search(url):
+                found[id(item)] = item
+        return list(found.values())
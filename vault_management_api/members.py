@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Indexed organization member lists and membership reconciliation."""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .bulk import BulkFailure
+from .vault_management_api import (
+    MemberStatus,
+    MemberType,
+    OrgMember,
+    VaultClient,
+    get_default_client,
+)
+
+
+def _value(x: Union[MemberStatus, MemberType, int]) -> int:
+    return x.value if isinstance(x, (MemberStatus, MemberType)) else x
+
+
+def _email_key(email: Optional[str]) -> Optional[str]:
+    return email.strip().lower() if email else None
+
+
+class MemberRoster:
+    """Members of one organization, indexed by id, email (case-insensitive),
+    status and type."""
+
+    def __init__(self, members: Iterable[OrgMember]):
+        self.members: Tuple[OrgMember, ...] = tuple(members)
+        self._by_id: Dict[str, OrgMember] = {}
+        self._by_email: Dict[str, OrgMember] = {}
+        by_status = defaultdict(list)
+        by_type = defaultdict(list)
+        for member in self.members:
+            self._by_id[member.id] = member
+            email = _email_key(member.email)
+            if email is not None:
+                self._by_email[email] = member
+            by_status[_value(member.status)].append(member)
+            by_type[_value(member.type)].append(member)
+        self._by_status = {key: tuple(value) for key, value in by_status.items()}
+        self._by_type = {key: tuple(value) for key, value in by_type.items()}
+
+    @classmethod
+    def load(cls, org_id: str, client: VaultClient = None) -> "MemberRoster":
+        return cls((client or get_default_client()).get_org_members(org_id))
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __iter__(self) -> Iterator[OrgMember]:
+        return iter(self.members)
+
+    def get(self, _id: str) -> Optional[OrgMember]:
+        return self._by_id.get(_id)
+
+    def by_email(self, email: str) -> Optional[OrgMember]:
+        return self._by_email.get(_email_key(email))
+
+    def with_status(self, status: Union[MemberStatus, int]) -> Tuple[OrgMember, ...]:
+        return self._by_status.get(_value(status), ())
+
+    def with_type(self, _type: Union[MemberType, int]) -> Tuple[OrgMember, ...]:
+        return self._by_type.get(_value(_type), ())
+
+    def emails(self, status: Union[MemberStatus, int] = None) -> FrozenSet[str]:
+        """Lower-cased emails of all members, or of those with `status`."""
+        members = self.members if status is None else self.with_status(status)
+        return frozenset(_email_key(m.email) for m in members if m.email is not None)
+
+
+@dataclass
+class ReconcileSummary:
+    """Outcome of `reconcile_members`; all emails are lower-cased.
+
+    `awaiting_acceptance` were invited but have not accepted, so they
+    cannot be confirmed yet; `not_invited` are not members at all.
+    `unexpected` are accepted or confirmed members not in the desired set;
+    they are reported, not removed.
+    """
+
+    confirmed: List[str] = field(default_factory=list)
+    already_confirmed: List[str] = field(default_factory=list)
+    awaiting_acceptance: List[str] = field(default_factory=list)
+    not_invited: List[str] = field(default_factory=list)
+    unexpected: List[str] = field(default_factory=list)
+    failures: List[BulkFailure] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def reconcile_members(
+    org_id: str,
+    desired: Iterable[str],
+    client: VaultClient = None,
+    max_workers: int = None,
+) -> ReconcileSummary:
+    """Confirm every accepted member of `org_id` whose email is in `desired`,
+    concurrently, and report how the membership differs from `desired`."""
+    client = client or get_default_client()
+    start = time.perf_counter()
+    roster = MemberRoster.load(org_id, client)
+    desired = {_email_key(email) for email in desired} - {None}
+    accepted = roster.emails(MemberStatus.Accepted)
+    confirmed = roster.emails(MemberStatus.Confirmed)
+
+    to_confirm = sorted(desired & accepted)
+    report = client.confirm_org_members(
+        org_id, [roster.by_email(email) for email in to_confirm], max_workers
+    )
+    failed = {failure.index for failure in report.failures}
+    summary = ReconcileSummary(
+        confirmed=[email for i, email in enumerate(to_confirm) if i not in failed],
+        already_confirmed=sorted(desired & confirmed),
+        awaiting_acceptance=sorted(desired & roster.emails(MemberStatus.Invited)),
+        not_invited=sorted(desired - roster.emails()),
+        unexpected=sorted((accepted | confirmed) - desired),
+        failures=report.failures,
+    )
+    summary.elapsed = time.perf_counter() - start
+    return summary
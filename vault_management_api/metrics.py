@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Request metrics for `VaultClient` and `AsyncVaultClient`.
+
+Pass a `Metrics` registry as `metrics` to a client and every HTTP request is
+recorded under its method and route, with the ids in the path replaced by
+`{id}` (`GET /object/item/{id}`): a latency histogram, a response size
+histogram, a count per status code and a count per exception type, plus
+the number of timeouts and retries. The time spent turning response data
+into model objects is recorded per model.
+
+Hooks registered with `add_hook` receive a `RequestEvent` for each request.
+`export` hands the registry to an exporter; `prometheus_text` renders the
+Prometheus text exposition format.
+"""
+
+import logging
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Path segments of the `bw serve` API; anything else is an id.
+_STATIC_SEGMENTS = frozenset(
+    [
+        "attachment",
+        "collection",
+        "collections",
+        "confirm",
+        "exposed",
+        "fingerprint",
+        "folder",
+        "folders",
+        "generate",
+        "item",
+        "items",
+        "list",
+        "lock",
+        "me",
+        "move",
+        "notes",
+        "object",
+        "org-collection",
+        "org-collections",
+        "org-member",
+        "org-members",
+        "organizations",
+        "password",
+        "remove-password",
+        "restore",
+        "send",
+        "status",
+        "sync",
+        "template",
+        "totp",
+        "unlock",
+        "uri",
+        "username",
+    ]
+)
+
+
+def route_of(url: str) -> str:
+    """Path of `url` without the query, with id segments replaced by `{id}`."""
+    segments = urlsplit(url).path.strip("/").split("/")
+    return "/" + "/".join(
+        segment if segment in _STATIC_SEGMENTS else "{id}" for segment in segments
+    )
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, as Prometheus uses."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """`(upper bound, count)` pairs, ending with `(inf, count)`."""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile."""
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+@dataclass
+class RequestEvent:
+    method: str
+    route: str
+    status: Optional[int]
+    seconds: float
+    size: int
+    error: Optional[str] = None
+
+
+class Metrics:
+    """Thread-safe registry of request and decode metrics."""
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ):
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._lock = threading.Lock()
+        self._hooks: List[Callable[[RequestEvent], None]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency: Dict[Tuple[str, str], Histogram] = {}
+            self.sizes: Dict[Tuple[str, str], Histogram] = {}
+            self.decode: Dict[str, Histogram] = {}
+            self.statuses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+            self.errors: Dict[Tuple[str, str, str], int] = defaultdict(int)
+            self.timeouts: Dict[Tuple[str, str], int] = defaultdict(int)
+            self.retries: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]) -> None:
+        self._hooks.remove(hook)
+
+    def observe_request(
+        self,
+        method: str,
+        url: str,
+        status: Optional[int],
+        seconds: float,
+        size: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        route = route_of(url)
+        key = (method, route)
+        with self._lock:
+            latency = self.latency.get(key)
+            if latency is None:
+                latency = self.latency[key] = Histogram(self.latency_buckets)
+                self.sizes[key] = Histogram(self.size_buckets)
+            latency.observe(seconds)
+            if error is None:
+                self.sizes[key].observe(size)
+                self.statuses[(method, route, status)] += 1
+            else:
+                self.errors[(method, route, error)] += 1
+        if self._hooks:
+            event = RequestEvent(method, route, status, seconds, size, error)
+            for hook in list(self._hooks):
+                try:
+                    hook(event)
+                except Exception:
+                    logger.exception("Metrics hook %r failed", hook)
+
+    def observe_timeout(self, method: str, url: str) -> None:
+        with self._lock:
+            self.timeouts[(method, route_of(url))] += 1
+
+    def observe_retry(self, method: str, url: str) -> None:
+        with self._lock:
+            self.retries[(method, route_of(url))] += 1
+
+    def observe_decode(self, model: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.decode.get(model)
+            if histogram is None:
+                histogram = self.decode[model] = Histogram(self.latency_buckets)
+            histogram.observe(seconds)
+
+    def export(self, exporter: Callable[["Metrics"], Any] = None) -> Any:
+        """Run `exporter` (default: `prometheus_text`) over the registry."""
+        with self._lock:
+            return (exporter or prometheus_text)(self)
+
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+def _histogram_lines(name: str, histograms: dict, label_names: tuple) -> List[str]:
+    lines = []
+    for key, histogram in sorted(histograms.items()):
+        values = key if isinstance(key, tuple) else (key,)
+        labels = _labels(**dict(zip(label_names, values)))
+        for bound, total in histogram.cumulative():
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def prometheus_text(metrics: Metrics, prefix: str = "vault") -> str:
+    """Render `metrics` in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {prefix}_request_duration_seconds Vault API request latency.",
+        f"# TYPE {prefix}_request_duration_seconds histogram",
+    ]
+    lines += _histogram_lines(
+        f"{prefix}_request_duration_seconds", metrics.latency, ("method", "route")
+    )
+    lines += [
+        f"# HELP {prefix}_response_size_bytes Vault API response body size.",
+        f"# TYPE {prefix}_response_size_bytes histogram",
+    ]
+    lines += _histogram_lines(
+        f"{prefix}_response_size_bytes", metrics.sizes, ("method", "route")
+    )
+    lines += [
+        f"# HELP {prefix}_responses_total Vault API responses by status code.",
+        f"# TYPE {prefix}_responses_total counter",
+    ]
+    for (method, route, status), count in sorted(metrics.statuses.items()):
+        labels = _labels(method=method, route=route, status=status)
+        lines.append(f"{prefix}_responses_total{{{labels}}} {count}")
+    lines += [
+        f"# HELP {prefix}_request_errors_total Vault API requests that raised.",
+        f"# TYPE {prefix}_request_errors_total counter",
+    ]
+    for (method, route, error), count in sorted(metrics.errors.items()):
+        labels = _labels(method=method, route=route, error=error)
+        lines.append(f"{prefix}_request_errors_total{{{labels}}} {count}")
+    for name, counts, text in (
+        ("timeouts", metrics.timeouts, "Vault API requests that timed out."),
+        ("retries", metrics.retries, "Vault API requests retried."),
+    ):
+        lines += [
+            f"# HELP {prefix}_request_{name}_total {text}",
+            f"# TYPE {prefix}_request_{name}_total counter",
+        ]
+        for (method, route), count in sorted(counts.items()):
+            labels = _labels(method=method, route=route)
+            lines.append(f"{prefix}_request_{name}_total{{{labels}}} {count}")
+    lines += [
+        f"# HELP {prefix}_decode_duration_seconds Time to build models from responses.",
+        f"# TYPE {prefix}_decode_duration_seconds histogram",
+    ]
+    lines += _histogram_lines(
+        f"{prefix}_decode_duration_seconds", metrics.decode, ("model",)
+    )
+    return "\n".join(lines) + "\n"
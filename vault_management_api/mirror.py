@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .compact import decode_compact_item
+from .matcher import UriMatcher
+from .snapshot import ItemChanges, ItemSnapshot, refresh_items
+from .vault_management_api import (
+    Collection,
+    Folder,
+    Item,
+    VaultClient,
+    decode_item,
+    get_default_client,
+)
+
+
+def uri_host(uri: Optional[str]) -> Optional[str]:
+    """Lower-cased hostname of a login URI, tolerating a missing scheme."""
+    if not uri:
+        return None
+    if "://" not in uri:
+        uri = f"//{uri}"
+    try:
+        return urlsplit(uri).hostname
+    except ValueError:
+        return None
+
+
+def _freeze(index: Dict) -> Dict:
+    return {key: tuple(values) for key, values in index.items()}
+
+
+class _MirrorIndex:
+    """Immutable set of lookup tables built from one vault snapshot."""
+
+    def __init__(
+        self,
+        items: Iterable[Item],
+        folders: Iterable[Folder],
+        collections: Iterable[Collection],
+    ):
+        self.items: Dict[str, Item] = {}
+        by_name = defaultdict(list)
+        by_folder = defaultdict(list)
+        by_organization = defaultdict(list)
+        by_collection = defaultdict(list)
+        by_host = defaultdict(list)
+        for item in items:
+            self.items[item.id] = item
+            by_name[item.name].append(item)
+            by_folder[item.folderId].append(item)
+            by_organization[item.organizationId].append(item)
+            for collection_id in item.collectionIds or ():
+                by_collection[collection_id].append(item)
+            if item.login is not None and item.login.uris:
+                hosts = {uri_host(uri.uri) for uri in item.login.uris}
+                for host in hosts - {None}:
+                    by_host[host].append(item)
+        self.by_name = _freeze(by_name)
+        self.by_folder = _freeze(by_folder)
+        self.by_organization = _freeze(by_organization)
+        self.by_collection = _freeze(by_collection)
+        self.by_host = _freeze(by_host)
+        self.names: List[str] = sorted(name for name in self.by_name if name)
+        self.folders: Dict[str, Folder] = {f.id: f for f in folders}
+        self.collections: Dict[str, Collection] = {c.id: c for c in collections}
+        self.matcher: Optional[UriMatcher] = None  # built on first use
+
+
+class VaultMirror:
+    """In-process copy of the vault with hash indexes over the items.
+
+    `refresh` fetches items, folders and collections and builds a complete
+    new index before swapping it in with a single assignment, so concurrent
+    readers always see either the old or the new snapshot, never a mix.
+    Items are diffed by `revisionDate`, so only new and changed items are
+    decoded again. With `compact=True` items are held as `CompactItem`s.
+    Returned tuples and objects are shared and must not be mutated.
+    """
+
+    def __init__(self, client: VaultClient = None, compact: bool = False):
+        self.client = client or get_default_client()
+        self._snapshot = ItemSnapshot(
+            decoder=decode_compact_item if compact else decode_item
+        )
+        self._index = _MirrorIndex((), (), ())
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, client: VaultClient = None, compact: bool = False) -> "VaultMirror":
+        mirror = cls(client, compact)
+        mirror.refresh()
+        return mirror
+
+    def refresh(self) -> ItemChanges:
+        with self._refresh_lock:
+            changes, snapshot = refresh_items(self._snapshot, self.client)
+            self._index = _MirrorIndex(
+                snapshot.items.values(),
+                self.client.get_folders(),
+                self.client.get_collections(),
+            )
+            self._snapshot = snapshot
+            return changes
+
+    def __len__(self) -> int:
+        return len(self._index.items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(tuple(self._index.items.values()))
+
+    def __contains__(self, _id: str) -> bool:
+        return _id in self._index.items
+
+    def get(self, _id: str) -> Optional[Item]:
+        return self._index.items.get(_id)
+
+    def by_name(self, name: str) -> Tuple[Item, ...]:
+        return self._index.by_name.get(name, ())
+
+    def by_folder(self, folder_id: Optional[str]) -> Tuple[Item, ...]:
+        return self._index.by_folder.get(folder_id, ())
+
+    def by_organization(self, org_id: Optional[str]) -> Tuple[Item, ...]:
+        return self._index.by_organization.get(org_id, ())
+
+    def by_collection(self, collection_id: str) -> Tuple[Item, ...]:
+        return self._index.by_collection.get(collection_id, ())
+
+    def by_host(self, host: str) -> Tuple[Item, ...]:
+        return self._index.by_host.get(host.lower(), ())
+
+    def match_url(self, url: str) -> List[Item]:
+        """Items with a login URI that matches `url` (see `UriMatcher`)."""
+        index = self._index
+        if index.matcher is None:
+            index.matcher = UriMatcher(index.items.values())
+        return index.matcher.match_url(url)
+
+    def by_name_prefix(self, prefix: str) -> List[Item]:
+        """Items whose name starts with `prefix`, in name order."""
+        index = self._index
+        names = index.names
+        items = []
+        for i in range(bisect_left(names, prefix), len(names)):
+            if not names[i].startswith(prefix):
+                break
+            items.extend(index.by_name[names[i]])
+        return items
+
+    def folder(self, _id: str) -> Optional[Folder]:
+        return self._index.folders.get(_id)
+
+    def collection(self, _id: str) -> Optional[Collection]:
+        return self._index.collections.get(_id)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import os
+import uuid
+from typing import BinaryIO, ContextManager, Iterator, Optional
+
+
+def stream_length(fileobj: BinaryIO) -> Optional[int]:
+    """Bytes left to read in `fileobj`, or None if that cannot be known."""
+    try:
+        return os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+    try:
+        position = fileobj.tell()
+        end = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(position)
+        return end - position
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+class MultipartFile:
+    """`multipart/form-data` body with a single file part, read lazily.
+
+    `requests` sends it in `chunk_size` reads with a `Content-Length`, so an
+    upload never holds more than one chunk of the file in memory. `length`
+    is needed when it cannot be determined from `fileobj` (e.g. a pipe).
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        filename: str,
+        field: str = "file",
+        length: int = None,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = 65536,
+    ):
+        if length is None:
+            length = stream_length(fileobj)
+        if length is None:
+            raise Exception(f"Cannot determine the size of {filename!r}; pass length")
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        quoted = filename.replace("\\", "\\\\").replace('"', '\\"')
+        head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{quoted}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self.length = len(head) + length + len(tail)
+        self._parts = [io.BytesIO(head), _Limited(fileobj, length), io.BytesIO(tail)]
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self.length
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(part.read() for part in self._parts)
+        chunks = []
+        while size > 0 and self._parts:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class _Limited:
+    """Reads at most `remaining` bytes of `fileobj`, failing if it ends early."""
+
+    def __init__(self, fileobj: BinaryIO, remaining: int):
+        self.fileobj = fileobj
+        self.remaining = remaining
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        if size == 0:
+            return b""
+        chunk = self.fileobj.read(size)
+        if not chunk:
+            raise Exception(f"File ended {self.remaining} bytes early")
+        self.remaining -= len(chunk)
+        return chunk
+
+
+def upload_name(file) -> str:
+    """File name to send for a path or an open file."""
+    name = file if isinstance(file, (str, os.PathLike)) else getattr(file, "name", "")
+    if not name or not isinstance(name, (str, os.PathLike)):
+        return "attachment"
+    return os.path.basename(os.fspath(name))
+
+
+def open_upload(file) -> ContextManager[BinaryIO]:
+    """Open a path for reading, or pass an open binary file through as is
+    (the caller keeps ownership of it)."""
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, "rb")
+    return contextlib.nullcontext(file)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Timeouts, deadlines and retry policy shared by both clients.
+
+A `Deadline` is an absolute point in time. Each attempt of a request gets
+connect and read timeouts of at most the time left before the deadline,
+and retries stop once the backoff would overrun it, so the whole call,
+retries included, stays within its budget. Deadlines come from the client's
+`deadline` setting, from a `deadline=` argument to the HTTP helpers, or
+from an enclosing `with deadline(seconds):` block; the earliest one wins.
+"""
+
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterator, Optional, Tuple, Union
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.expires = clock() + seconds
+
+    def remaining(self) -> float:
+        return self.expires - self.clock()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @staticmethod
+    def earliest(*deadlines: Optional["Deadline"]) -> Optional["Deadline"]:
+        deadlines = [d for d in deadlines if d is not None]
+        return min(deadlines, key=lambda d: d.expires) if deadlines else None
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "vault_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Bound every request made inside the block (in this thread or task) to
+    finish within `seconds` in total. Nested blocks can only shorten it."""
+    scope = Deadline.earliest(Deadline(seconds), _current_deadline.get())
+    token = _current_deadline.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def split_timeout(timeout: Timeout) -> Tuple[Optional[float], Optional[float]]:
+    """`(connect, read)` from a single value or a pair, as `requests` takes."""
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+def attempt_timeout(
+    timeout: Timeout, deadline: Optional[Deadline]
+) -> Tuple[Optional[float], Optional[float]]:
+    """Connect and read timeouts for the next attempt, capped by `deadline`.
+    Raises `DeadlineExceeded` if no time is left."""
+    connect, read = split_timeout(timeout)
+    if deadline is None:
+        return connect, read
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded before the request was sent")
+    return (
+        remaining if connect is None else min(connect, remaining),
+        remaining if read is None else min(read, remaining),
+    )
+
+
+@dataclass
+class RetryPolicy:
+    """Retry failed attempts of idempotent requests with jittered backoff.
+
+    Only `methods` are retried, after a connection error, a timeout or one of
+    `statuses`. The n-th retry waits a random time of up to
+    `min(max_backoff, backoff * 2 ** n)` seconds ("full jitter").
+    """
+
+    attempts: int = 3
+    backoff: float = 0.1
+    max_backoff: float = 2.0
+    methods: FrozenSet[str] = frozenset({"GET"})
+    statuses: FrozenSet[int] = frozenset({502, 503, 504})
+
+    def delay(self, retry: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**retry))
+
+    def should_retry(
+        self, method: str, attempt: int, deadline: Optional[Deadline], delay: float
+    ) -> bool:
+        """Whether attempt number `attempt` (from 1) may be followed by
+        another one after sleeping `delay` seconds."""
+        if method not in self.methods or attempt >= self.attempts:
+            return False
+        return deadline is None or delay < deadline.remaining()
+
+
+NO_RETRY = RetryPolicy(attempts=1)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Background `sync()` on an interval, with explicit requests coalesced.
+
+`SyncScheduler` runs `client.sync()` from one daemon thread every
+`interval` seconds, each wait stretched or shortened by up to `jitter`
+(a fraction of the interval) so that several processes started together
+do not sync in lockstep. `request_sync()` asks for a sync soon: the first
+request schedules one `window` seconds later and every request made until
+it starts is served by that same sync. A sync, periodic or requested,
+restarts the interval.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+from .vault_management_api import VaultClient, get_default_client
+
+logger = logging.getLogger(__name__)
+
+
+class SyncScheduler:
+    """Runs `sync()` for `client` in the background once `start`ed.
+
+    `last_sync` is the wall-clock time (`time.time()`) the last sync
+    finished, `last_duration` how many seconds it took and `last_error` the
+    exception it raised, if any. `syncs` counts finished syncs and
+    `requests` the `request_sync` calls they served.
+    """
+
+    def __init__(
+        self,
+        client: VaultClient = None,
+        interval: float = 300.0,
+        jitter: float = 0.1,
+        window: float = 1.0,
+    ):
+        self.client = client or get_default_client()
+        self.interval = interval
+        self.jitter = jitter
+        self.window = window
+        self.last_sync: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[Exception] = None
+        self.syncs = 0
+        self.requests = 0
+        self._cond = threading.Condition()
+        self._started = 0
+        self._requested_at: Optional[float] = None
+        self._pending = 0
+        self._next_run = 0.0
+        self._stopped = True
+        self._thread: Optional[threading.Thread] = None
+
+    def _delay(self) -> float:
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def start(self) -> "SyncScheduler":
+        with self._cond:
+            if self._thread is not None:
+                return self
+            self._stopped = False
+            self._next_run = time.monotonic() + self._delay()
+            self._thread = threading.Thread(
+                target=self._run, name="vault-sync", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        """Stop the thread after the sync in progress, if any; waiters for
+        syncs that will not run are released."""
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def __enter__(self) -> "SyncScheduler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def syncing(self) -> bool:
+        return self._started > self.syncs
+
+    def request_sync(self, wait: bool = False, timeout: float = None) -> bool:
+        """Ask for a sync within `window` seconds. With `wait`, block until
+        a sync that started after this call has finished; returns False if
+        `timeout` passed or the scheduler stopped first."""
+        with self._cond:
+            if self._requested_at is None:
+                self._requested_at = time.monotonic()
+                self._cond.notify_all()
+            self._pending += 1
+            target = self._started + 1
+            if wait:
+                self._cond.wait_for(
+                    lambda: self.syncs >= target or self._stopped, timeout
+                )
+            return not wait or self.syncs >= target
+
+    def wait_for_sync(self, timeout: float = None) -> bool:
+        """Wait for the sync in progress, if any, to finish; returns False
+        if `timeout` passed first. Reads that must not see data older than a
+        running sync can call this instead of syncing themselves."""
+        with self._cond:
+            target = self._started
+            self._cond.wait_for(lambda: self.syncs >= target or self._stopped, timeout)
+            return self.syncs >= target
+
+    def _due(self) -> float:
+        if self._requested_at is None:
+            return self._next_run
+        return min(self._next_run, self._requested_at + self.window)
+
+    def _run(self) -> None:
+        me = threading.current_thread()
+        while True:
+            with self._cond:
+                while self._thread is me:
+                    delay = self._due() - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                if self._thread is not me:  # stopped, maybe restarted since
+                    return
+                served, self._pending = self._pending, 0
+                self._requested_at = None
+                self._started += 1
+            self._sync(served)
+
+    def _sync(self, served: int) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            response = self.client.sync()
+            if not response.get("success", True):
+                raise Exception(response.get("message") or "Sync failed")
+        except Exception as e:
+            logger.warning("Background sync failed: %r", e)
+            error = e
+        duration = time.perf_counter() - start
+        with self._cond:
+            self.last_sync = time.time()
+            self.last_duration = duration
+            self.last_error = error
+            self.syncs += 1
+            self.requests += served
+            self._next_run = time.monotonic() + self._delay()
+            self._cond.notify_all()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Re-unlocking the vault when `bw serve` reports it locked.
+
+A client given a session manager inspects failed responses for the
+"Vault is locked." message instead of calling `status()` before requests.
+On a locked response the manager unlocks the vault with the password from
+its `credentials` callback and the client replays the request once. Every
+request that found the vault locked shares a single unlock: concurrent
+callers wait for the one in flight, and a caller whose request was sent
+before the last successful unlock only replays.
+"""
+
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Union
+
+from .jsonlib import loads
+from .singleflight import AsyncSingleFlight, SingleFlight
+
+LOCKED_MESSAGE = "Vault is locked"
+
+# Requests that are never replayed
+LOCK_ROUTES = frozenset(["/lock", "/unlock"])
+
+
+def is_locked(status: int, body: Any) -> bool:
+    """Whether a decoded response body is `bw serve`'s locked error."""
+    if status < 400 or not isinstance(body, dict) or body.get("success", True):
+        return False
+    return (body.get("message") or "").startswith(LOCKED_MESSAGE)
+
+
+def is_locked_body(status: int, body: Union[bytes, str]) -> bool:
+    """`is_locked` for a body that has not been decoded yet."""
+    if status < 400:
+        return False
+    try:
+        return is_locked(status, loads(body))
+    except ValueError:
+        return False
+
+
+def _check_unlocked(response: dict) -> None:
+    if not response.get("success", False):
+        raise Exception(response.get("message") or "Unable to unlock the vault")
+
+
+class SessionManager:
+    """Unlocks a `VaultClient`'s vault on demand.
+
+    `credentials` returns the master password; it is called once per
+    unlock, so it may fetch the password from a secret store each time.
+    `generation` counts successful unlocks and `unlocks` is kept as a
+    plain counter for monitoring.
+    """
+
+    def __init__(self, credentials: Callable[[], str]):
+        self.credentials = credentials
+        self.generation = 0
+        self.unlocks = 0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def unlock(self, client, seen: int) -> None:
+        """Unlock through `client` unless the vault was unlocked since
+        `generation` was `seen`."""
+        if self.generation == seen:
+            self._flight.do("unlock", lambda: self._unlock(client, seen))
+
+    def _unlock(self, client, seen: int) -> None:
+        if self.generation != seen:
+            return
+        _check_unlocked(client.unlock(self.credentials()))
+        with self._lock:
+            self.generation += 1
+            self.unlocks += 1
+
+
+class AsyncSessionManager:
+    """`SessionManager` for `AsyncVaultClient`; `credentials` may also be a
+    coroutine function."""
+
+    def __init__(self, credentials: Callable[[], Union[str, Awaitable[str]]]):
+        self.credentials = credentials
+        self.generation = 0
+        self.unlocks = 0
+        self._flight = AsyncSingleFlight()
+
+    async def unlock(self, client, seen: int) -> None:
+        if self.generation == seen:
+            await self._flight.do("unlock", lambda: self._unlock(client, seen))
+
+    async def _unlock(self, client, seen: int) -> None:
+        if self.generation != seen:
+            return
+        password = self.credentials()
+        if inspect.isawaitable(password):
+            password = await password
+        _check_unlocked(await client.unlock(password))
+        self.generation += 1
+        self.unlocks += 1
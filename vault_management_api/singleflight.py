@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Coalescing of concurrent identical calls.
+
+While a call for a key is in flight, further calls for the same key do not
+run their function; they wait for the first one and get its result (or its
+exception). The key is forgotten as soon as the call completes, so nothing
+is cached: a call that starts afterwards runs again. `forget` makes calls
+that start from now on run again even while earlier ones are in flight,
+e.g. after a write that those earlier calls may not have seen.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .retry import DeadlineExceeded
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-based single-flight group."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float = None) -> Any:
+        """Run `fn`, or wait up to `timeout` seconds for the running call for
+        `key` and return its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+        if not leader:
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded("Deadline exceeded waiting for a shared call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+
+class AsyncSingleFlight:
+    """asyncio single-flight group. The shared call runs as its own task, so
+    cancelling one waiter does not cancel it for the others."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], Awaitable], timeout: float = None
+    ) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.calls += 1
+        else:
+            self.shared += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            if task.done():
+                raise
+            raise DeadlineExceeded("Deadline exceeded waiting for a shared call")
+
+    def forget(self) -> None:
+        self._calls.clear()
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every waiter went away
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .vault_management_api import Item, VaultClient, decode_item, get_default_client
+
+
+@dataclass
+class ItemChanges:
+    added: List[Item] = field(default_factory=list)
+    changed: List[Item] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class ItemSnapshot:
+    """Decoded items of one vault listing, keyed by id.
+
+    `diff` compares a fresh listing against the snapshot by `revisionDate`
+    and only decodes items that are new or whose revision changed, using
+    `decoder` (e.g. `decode_compact_item` to hold `CompactItem`s).
+    """
+
+    def __init__(
+        self,
+        items: Dict[str, Item] = None,
+        decoder: Callable[[dict], Item] = decode_item,
+    ):
+        self.items: Dict[str, Item] = items if items is not None else {}
+        self.decoder = decoder
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def diff(self, raw_items: Iterable[dict]) -> Tuple[ItemChanges, "ItemSnapshot"]:
+        changes = ItemChanges()
+        items = {}
+        decoder = self.decoder
+        for raw in raw_items:
+            _id = raw.get("id")
+            revisionDate = raw.get("revisionDate")
+            previous = self.items.get(_id)
+            if (
+                previous is not None
+                and revisionDate is not None
+                and previous.revisionDate == revisionDate
+            ):
+                items[_id] = previous
+                continue
+            item = decoder(raw)
+            items[_id] = item
+            if previous is None:
+                changes.added.append(item)
+            else:
+                changes.changed.append(item)
+        changes.removed = [_id for _id in self.items if _id not in items]
+        return changes, ItemSnapshot(items, decoder)
+
+
+def refresh_items(
+    snapshot: ItemSnapshot = None, client: VaultClient = None
+) -> Tuple[ItemChanges, ItemSnapshot]:
+    """Stream the item list and diff it against `snapshot`.
+
+    Changed and removed items are also invalidated in the client's cache.
+    """
+    client = client or get_default_client()
+    changes, snapshot = (snapshot or ItemSnapshot()).diff(client.iter_raw_items())
+    if client.cache is not None:
+        for item in changes.changed:
+            client.cache.invalidate(("item", item.id))
+        for _id in changes.removed:
+            client.cache.invalidate(("item", _id))
+    return changes, snapshot
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+_NEED_DATA = object()
+_WHITESPACE = " \t\r\n"
+
+
+class JsonArrayStream:
+    """Incremental decoder for one array nested inside a JSON document.
+
+    `path` names the object keys leading to the array, e.g. `("data", "data")`
+    for the `bw serve` list envelope. Bytes are pushed in with `feed`, which
+    returns the array elements completed so far; `close` flushes the rest.
+    Only the element currently being decoded is buffered, so memory stays
+    bounded by the largest element rather than the whole document.
+
+    `envelope` holds the top-level members read before the array, such as
+    the `success` and `message` of an error response that has no array.
+    """
+
+    def __init__(self, path: Tuple[str, ...]):
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._done = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scan = json.JSONDecoder().raw_decode
+        self.envelope: Dict[str, Any] = {}
+        self._walker = self._walk(path)
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buf = self._buf[self._pos :] + self._decoder.decode(chunk)
+        self._pos = 0
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        self._buf += self._decoder.decode(b"", final=True)
+        self._eof = True
+        values = self._drain()
+        if not self._done:
+            raise ValueError("Unexpected end of JSON stream")
+        return values
+
+    def _drain(self) -> List[Any]:
+        values = []
+        if self._done:
+            return values
+        for value in self._walker:
+            if value is _NEED_DATA:
+                return values
+            values.append(value)
+        self._done = True
+        return values
+
+    def _more(self):
+        if self._eof:
+            raise ValueError("Unexpected end of JSON stream")
+        yield _NEED_DATA
+
+    def _char(self):
+        # Consume and return the next non-whitespace character.
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                self._pos += 1
+                return buf[pos]
+            yield from self._more()
+
+    def _peek(self):
+        char = yield from self._char()
+        self._pos -= 1
+        return char
+
+    def _value(self):
+        yield from self._peek()
+        while True:
+            try:
+                value, end = self._scan(self._buf, self._pos)
+            except json.JSONDecodeError:
+                yield from self._more()
+                continue
+            # A number at the very end of the buffer may still be incomplete.
+            if end == len(self._buf) and not self._eof:
+                yield from self._more()
+                continue
+            self._pos = end
+            return value
+
+    def _walk(self, path):
+        for depth, key in enumerate(path):
+            if (yield from self._char()) != "{":
+                raise ValueError(f"Expected an object at {key!r}")
+            while True:
+                if (yield from self._peek()) == "}":
+                    raise ValueError(f"Key {key!r} not found")
+                name = yield from self._value()
+                if (yield from self._char()) != ":":
+                    raise ValueError("Expected ':'")
+                if name == key:
+                    break
+                value = yield from self._value()
+                if depth == 0:
+                    self.envelope[name] = value
+                separator = yield from self._char()
+                if separator == "}":
+                    raise ValueError(f"Key {key!r} not found")
+                if separator != ",":
+                    raise ValueError("Expected ',' or '}'")
+        if (yield from self._char()) != "[":
+            raise ValueError("Expected an array")
+        if (yield from self._peek()) == "]":
+            return
+        while True:
+            yield (yield from self._value())
+            separator = yield from self._char()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError("Expected ',' or ']'")
+
+
+def iter_json_array(chunks: Iterable[bytes], path: Tuple[str, ...]) -> Iterator[Any]:
+    """Yield the elements of the array at `path` while reading `chunks`."""
+    stream = JsonArrayStream(path)
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
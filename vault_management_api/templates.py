@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Render templates that reference vault secrets.
+
+A reference looks like `{{ vault:<item id>:<field> }}` or
+`{{ vault:name=<item name>:<field> }}`, where `<field>` is one of `id`,
+`name`, `username`, `password`, `totp`, `uri` (the first login URI),
+`notes` or `fields.<custom field name>`. References must not span lines.
+
+Rendering takes two passes over the template. The first collects every
+distinct reference, which are then resolved together from one streamed
+`/list/object/items` response (or from a `VaultMirror`), plus one request
+per item for `totp`, since codes are generated by the server. The second
+pass substitutes the values line by line, so templates of any size are
+rendered without holding them in memory, and nothing is written if a
+reference cannot be resolved.
+"""
+
+import re
+import shutil
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, TextIO
+
+from .mirror import VaultMirror
+from .vault_management_api import Item, VaultClient, decode_item, get_default_client
+
+REFERENCE = re.compile(r"\{\{\s*vault:([^}]*):([^:}]+?)\s*\}\}")
+
+FIELDS = frozenset(["id", "name", "username", "password", "totp", "uri", "notes"])
+
+
+@dataclass(frozen=True)
+class Reference:
+    item: str
+    by_name: bool
+    field: str
+
+    @staticmethod
+    def from_match(match: "re.Match") -> "Reference":
+        selector, field = match.group(1).strip(), match.group(2)
+        if field not in FIELDS and not field.startswith("fields."):
+            raise Exception(f"Unknown field in template reference: {match.group(0)}")
+        if selector.startswith("name="):
+            return Reference(selector[len("name=") :], True, field)
+        return Reference(selector, False, field)
+
+    def __str__(self) -> str:
+        selector = f"name={self.item}" if self.by_name else self.item
+        return f"vault:{selector}:{self.field}"
+
+
+def _field_value(item: Item, field: str) -> Optional[str]:
+    login = item.login
+    if field == "id":
+        return item.id
+    if field == "name":
+        return item.name
+    if field == "notes":
+        return item.notes
+    if field in ("username", "password"):
+        return getattr(login, field) if login is not None else None
+    if field == "uri":
+        uris = login.uris if login is not None else None
+        return uris[0].uri if uris else None
+    name = field[len("fields.") :]
+    for custom in item.fields or ():
+        if custom.name == name:
+            return custom.value
+    return None
+
+
+class TemplateRenderer:
+    """Resolves and substitutes vault references. With `strict` (the
+    default) unresolved references raise; otherwise they are left as is."""
+
+    def __init__(
+        self,
+        client: VaultClient = None,
+        mirror: VaultMirror = None,
+        strict: bool = True,
+    ):
+        self.client = client or (mirror.client if mirror else get_default_client())
+        self.mirror = mirror
+        self.strict = strict
+
+    @staticmethod
+    def references(lines: Iterable[str]) -> Set[Reference]:
+        found = set()
+        for line in lines:
+            if "{{" in line:
+                found.update(map(Reference.from_match, REFERENCE.finditer(line)))
+        return found
+
+    def _items(self, refs: Set[Reference]) -> Dict[Reference, List[Item]]:
+        ids = {ref.item for ref in refs if not ref.by_name}
+        names = {ref.item for ref in refs if ref.by_name}
+        by_id: Dict[str, Item] = {}
+        by_name: Dict[str, List[Item]] = defaultdict(list)
+        if self.mirror is not None:
+            for _id in ids:
+                item = self.mirror.get(_id)
+                if item is not None:
+                    by_id[_id] = item
+            for name in names:
+                by_name[name].extend(self.mirror.by_name(name))
+        elif refs:
+            for raw in self.client.iter_raw_items():
+                if raw.get("id") in ids or raw.get("name") in names:
+                    item = decode_item(raw)
+                    if item.id in ids:
+                        by_id[item.id] = item
+                    if item.name in names:
+                        by_name[item.name].append(item)
+        matches = {}
+        for ref in refs:
+            if ref.by_name:
+                matches[ref] = by_name.get(ref.item, [])
+            else:
+                matches[ref] = [by_id[ref.item]] if ref.item in by_id else []
+        return matches
+
+    def resolve(self, refs: Set[Reference]) -> Dict[Reference, str]:
+        """Values for `refs`; raises listing every problem if `strict`."""
+        items = self._items(refs)
+        problems = []
+        values = {}
+        totps = {}
+        for ref, matches in items.items():
+            if len(matches) != 1:
+                problems.append(f"{ref} matches {len(matches)} items")
+            elif ref.field == "totp":
+                totps[ref] = matches[0].id
+            else:
+                value = _field_value(matches[0], ref.field)
+                if value is None:
+                    problems.append(f"{ref} has no value")
+                else:
+                    values[ref] = value
+        if totps:
+            codes = self.client.get_totps(totps.values())
+            for ref, _id in totps.items():
+                if _id in codes.values:
+                    values[ref] = codes.values[_id]
+                else:
+                    problems.append(f"{ref} has no TOTP code")
+        if problems and self.strict:
+            raise Exception("Cannot render template: " + "; ".join(sorted(problems)))
+        return values
+
+    def _substitute(self, line: str, values: Dict[Reference, str]) -> str:
+        if "{{" not in line:
+            return line
+
+        def value(match):
+            return values.get(Reference.from_match(match), match.group(0))
+
+        return REFERENCE.sub(value, line)
+
+    def _write(self, source: TextIO, out: TextIO, values: Dict[Reference, str]):
+        for line in source:
+            out.write(self._substitute(line, values))
+
+    def render(self, text: str) -> str:
+        lines = text.splitlines(keepends=True)
+        values = self.resolve(self.references(lines))
+        return "".join(self._substitute(line, values) for line in lines)
+
+    def render_stream(self, source: TextIO, out: TextIO) -> int:
+        """Render `source` into `out` and return the number of references
+        resolved. A `source` that cannot seek is spooled to a temporary
+        file for the second pass."""
+        if not source.seekable():
+            spool = tempfile.SpooledTemporaryFile(
+                max_size=2**22, mode="w+", encoding="utf-8", newline=""
+            )
+            shutil.copyfileobj(source, spool)
+            spool.seek(0)
+            source = spool
+        start = source.tell()
+        values = self.resolve(self.references(source))
+        source.seek(start)
+        self._write(source, out, values)
+        return len(values)
+
+    def render_file(self, src: str, dst: str) -> int:
+        """Render the template at path `src` into the file `dst`."""
+        with open(src, encoding="utf-8", newline="") as source:
+            values = self.resolve(self.references(source))
+            source.seek(0)
+            with open(dst, "w", encoding="utf-8", newline="") as out:
+                self._write(source, out, values)
+        return len(values)
+
+
+def render_template(text: str, client: VaultClient = None, strict: bool = True) -> str:
+    return TemplateRenderer(client, strict=strict).render(text)
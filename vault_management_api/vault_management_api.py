@@ -1,15 +1,59 @@
 #!/usr/bin/env python3
 import datetime
+import io
 import json
-
-# import logging # @TODO: implement logging
+import logging
 import os
-from dataclasses import dataclass
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
 from enum import Enum
-from typing import List, Any, Optional, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+
+from .bulk import BatchResult, BulkFailure, BulkReport, run_bulk
+from .cache import MISSING, LRUCache
+from .decoders import (
+    CALL,
+    ENUM,
+    EXPR,
+    OPT_ENUM,
+    OPT_INT,
+    OPT_LIST,
+    OPT_NESTED,
+    OPT_STR_LIST,
+    RAW,
+    compile_decoder,
+    compile_decoders,
+)
+from .jsonlib import JSON_CONTENT_TYPE, dumps, dumps_pretty, loads
+from .metrics import Metrics
+from .multipart import MultipartFile, open_upload, upload_name
+from .retry import (
+    Deadline,
+    RetryPolicy,
+    Timeout,
+    attempt_timeout,
+    current_deadline,
+)
+from .session import LOCK_ROUTES, SessionManager, is_locked_body
+from .singleflight import SingleFlight
+from .streaming import JsonArrayStream
 
 
 def from_int(x: Any) -> int:
@@ -88,6 +132,17 @@ class ItemType(Enum):
         return self.value
 
 
+class FieldType(Enum):
+    TEXT = 0
+    HIDDEN = 1
+    BOOLEAN = 2
+    LINKED = 3
+
+    @staticmethod
+    def to_dict(self):
+        return self.value
+
+
 class CardType(Enum):
     VISA = 1
     MASTERCARD = 2
@@ -127,6 +182,17 @@ class MemberType(Enum):
         return self.value
 
 
+class MemberStatus(Enum):
+    Revoked = -1
+    Invited = 0
+    Accepted = 1
+    Confirmed = 2
+
+    @staticmethod
+    def to_dict(self):
+        return self.value
+
+
 class SendType(Enum):
     TEXT = 0
     FILE = 1
@@ -170,7 +236,8 @@ class Uri:
 
     @staticmethod
     def from_file(path: str) -> "Uri":
-        return Uri.from_dict(json.loads(path))
+        with open(path, "r") as f:
+            return Uri.from_json(f.read())
 
 
 @dataclass
@@ -406,14 +473,14 @@ class Identity:
 class Field:
     name: Optional[str]
     value: Optional[str]
-    type: Optional[Enum]
+    type: Optional[FieldType]
 
     @staticmethod
     def from_dict(obj: Any) -> "Field":
         assert isinstance(obj, dict)
         name = from_union([from_str, from_none], obj.get("name"))
         value = from_union([from_str, from_none], obj.get("value"))
-        _type = from_union([ItemType, from_none], obj.get("type"))
+        _type = from_union([FieldType, from_none], obj.get("type"))
         return Field(name, value, _type)
 
     def to_dict(self) -> dict:
@@ -450,7 +517,7 @@ class Item:
     name: str
     notes: Optional[str]
     favorite: bool
-    fields: Optional[Field]
+    fields: Optional[List[Field]]
     login: Optional[Login]
     secureNote: Optional[SecureNote]
     card: Optional[Card]
@@ -458,6 +525,8 @@ class Item:
     reprompt: bool
     object: str = "item"
     id: str = None
+    collectionIds: Optional[List[str]] = None
+    revisionDate: Optional[str] = None
 
     @staticmethod
     def from_dict(obj: Any) -> "Item":
@@ -471,7 +540,9 @@ class Item:
         name = from_str(obj.get("name"))
         notes = from_union([from_str, from_none], obj.get("notes"))
         favorite = from_bool(obj.get("favorite"))
-        fields = from_union([Field.from_dict, from_none], obj.get("fields"))
+        fields = from_union(
+            [lambda x: from_list(Field.from_dict, x), from_none], obj.get("fields")
+        )
         login = from_union([Login.from_dict, from_none], obj.get("login"))
         secureNote = from_union(
             [SecureNote.from_dict, from_none], obj.get("secureNote")
@@ -481,6 +552,10 @@ class Item:
         reprompt = from_bool(obj.get("reprompt")).__int__()
         _object = from_str(obj.get("object"))
         _id = from_str(obj.get("id"))
+        collectionIds = from_union(
+            [lambda x: from_list(from_str, x), from_none], obj.get("collectionIds")
+        )
+        revisionDate = from_union([from_str, from_none], obj.get("revisionDate"))
         return Item(
             organizationId,
             collectionId,
@@ -497,6 +572,8 @@ class Item:
             reprompt,
             _object,
             _id,
+            collectionIds,
+            revisionDate,
         )
 
     def to_dict(self) -> dict:
@@ -509,7 +586,8 @@ class Item:
             "notes": from_str(self.notes),
             "favorite": from_bool(self.favorite),
             "fields": from_union(
-                [lambda x: to_class(Field, x), from_none], self.fields
+                [lambda x: from_list(lambda y: to_class(Field, y), x), from_none],
+                self.fields,
             ),
             "login": from_union([lambda x: to_class(Login, x), from_none], self.login),
             "secureNote": from_union(
@@ -522,6 +600,10 @@ class Item:
             "reprompt": from_bool(self.reprompt).__int__(),
             "object": from_str(self.object),
             "id": from_str(self.id),
+            "collectionIds": from_union(
+                [lambda x: from_list(from_str, x), from_none], self.collectionIds
+            ),
+            "revisionDate": from_union([from_str, from_none], self.revisionDate),
         }
 
         if self.type == ItemType.LOGIN:
@@ -543,11 +625,11 @@ class Item:
         return result
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2, cls=CustomEncoder)
+        return dumps_pretty(self.to_dict()).decode()
 
     @staticmethod
     def from_json(s: str) -> "Item":
-        return Item.from_dict(json.loads(s))
+        return Item.from_dict(loads(s))
 
     def to_file(self, path: str) -> None:
         with open(path, "w") as f:
@@ -660,7 +742,7 @@ class Folder:
         name = from_str(obj.get("name"))
         _id = from_str(obj.get("id"))
         _object = from_str(obj.get("object"))
-        return Folder(name)
+        return Folder(name, _id, _object)
 
     def to_dict(self) -> dict:
         result: dict = {
@@ -693,6 +775,7 @@ class Collection:
     name: str
     externalId: Optional[str]
     groups: Optional[List[Group]]
+    id: Optional[str] = None
 
     @staticmethod
     def from_dict(obj: Any) -> "Collection":
@@ -703,7 +786,8 @@ class Collection:
         groups = from_union(
             [lambda x: from_list(Group.from_dict, x), from_none], obj.get("groups")
         )
-        return Collection(organizationId, name, externalId, groups)
+        _id = from_str(obj.get("id"))
+        return Collection(organizationId, name, externalId, groups, _id)
 
     def to_dict(self) -> dict:
         result: dict = {
@@ -714,6 +798,7 @@ class Collection:
                 [lambda x: from_list(lambda y: to_class(Group, y), x), from_none],
                 self.groups,
             ),
+            "id": from_str(self.id) if self.id else None,
         }
         return result
 
@@ -767,6 +852,23 @@ class SendText:
             return SendText.from_json(f.read())
 
 
+def _parse_send_date(value: Optional[str], label: str) -> Optional[datetime.datetime]:
+    if value is None:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+    except ValueError:
+        raise ValueError(
+            f"Invalid {label} date format: {value}. Expected format: %Y-%m-%dT%H:%M:%S.%fZ"
+        )
+
+
+def _format_send_date(value: Optional[datetime.datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
 @dataclass
 class Send:
     name: str
@@ -790,28 +892,8 @@ class Send:
         text = from_union([SendText.from_dict, from_none], obj.get("text"))
         file = from_union([from_str, from_none], obj.get("file"))
         maxAccessCount = from_union([from_int, from_none], obj.get("maxAccessCount"))
-        deletionDateStr = obj.get("deletionDate")
-        deletionDate = None
-        if deletionDateStr is not None:
-            try:
-                deletionDate = datetime.datetime.strptime(
-                    deletionDateStr, "%Y-%m-%dT%H:%M:%S.%fZ"
-                )
-            except ValueError:
-                raise ValueError(
-                    f"Invalid deletion date format: {deletionDateStr}. Expected format: %Y-%m-%dT%H:%M:%S.%fZ"
-                )
-        expirationDateStr = obj.get("expirationDate")
-        expirationDate = None
-        if expirationDateStr is not None:
-            try:
-                expirationDate = datetime.datetime.strptime(
-                    expirationDateStr, "%Y-%m-%dT%H:%M:%S.%fZ"
-                )
-            except ValueError:
-                raise ValueError(
-                    f"Invalid expiration date format: {expirationDateStr}. Expected format: %Y-%m-%dT%H:%M:%S.%fZ"
-                )
+        deletionDate = _parse_send_date(obj.get("deletionDate"), "deletion")
+        expirationDate = _parse_send_date(obj.get("expirationDate"), "expiration")
         password = from_union([from_str, from_none], obj.get("password"))
         disabled = from_union([from_bool, from_none], obj.get("disabled"))
         hideEmail = from_union([from_bool, from_none], obj.get("hideEmail"))
@@ -837,8 +919,8 @@ class Send:
             "text": from_union([lambda x: to_class(SendText, x), from_none], self.text),
             "file": from_union([from_str, from_none], self.file),
             "maxAccessCount": from_union([from_int, from_none], self.maxAccessCount),
-            "deletionDate": str(self.deletionDate) if self.deletionDate else None,
-            "expirationDate": str(self.expirationDate) if self.expirationDate else None,
+            "deletionDate": _format_send_date(self.deletionDate),
+            "expirationDate": _format_send_date(self.expirationDate),
             "password": from_union([from_str, from_none], self.password),
             "disabled": from_union([from_bool, from_none], self.disabled),
             "hideEmail": from_union([from_bool, from_none], self.hideEmail),
@@ -862,49 +944,1293 @@ class Send:
             return Send.from_json(f.read())
 
 
+# Compiled decoders, equivalent to the from_dict methods above. The client
+# decodes responses with these; see decoders.py.
+DECODER_SPECS = {
+    Uri: [
+        ("match", "match", OPT_ENUM, MatchType),
+        ("uri", "uri", RAW, None),
+    ],
+    Login: [
+        ("uris", "uris", OPT_LIST, Uri),
+        ("username", "username", RAW, None),
+        ("password", "password", RAW, None),
+        ("totp", "totp", RAW, None),
+    ],
+    SecureNote: [("type", "type", OPT_INT, None)],
+    Card: [
+        ("cardHolderName", "cardHolderName", RAW, None),
+        ("brand", "brand", ENUM, CardType),
+        ("number", "number", RAW, None),
+        ("expMonth", "expMonth", RAW, None),
+        ("expYear", "expYear", RAW, None),
+        ("code", "code", RAW, None),
+    ],
+    Identity: [(f.name, f.name, RAW, None) for f in fields(Identity)],
+    Field: [
+        ("name", "name", RAW, None),
+        ("value", "value", RAW, None),
+        ("type", "type", OPT_ENUM, FieldType),
+    ],
+    Item: [
+        ("organizationId", "organizationId", RAW, None),
+        ("collectionId", "collectionId", EXPR, "v if v else []"),
+        ("folderId", "folderId", RAW, None),
+        ("type", "type", ENUM, ItemType),
+        ("name", "name", RAW, None),
+        ("notes", "notes", RAW, None),
+        ("favorite", "favorite", RAW, None),
+        ("fields", "fields", OPT_LIST, Field),
+        ("login", "login", OPT_NESTED, Login),
+        ("secureNote", "secureNote", OPT_NESTED, SecureNote),
+        ("card", "card", OPT_NESTED, Card),
+        ("identity", "identity", OPT_NESTED, Identity),
+        ("reprompt", "reprompt", EXPR, "v.__int__()"),
+        ("object", "object", RAW, None),
+        ("id", "id", RAW, None),
+        ("collectionIds", "collectionIds", OPT_STR_LIST, None),
+        ("revisionDate", "revisionDate", RAW, None),
+    ],
+    OrgMember: [(f.name, f.name, RAW, None) for f in fields(OrgMember)],
+    Group: [(f.name, f.name, RAW, None) for f in fields(Group)],
+    Folder: [(f.name, f.name, RAW, None) for f in fields(Folder)],
+    Collection: [
+        ("organizationId", "organizationId", RAW, None),
+        ("name", "name", RAW, None),
+        ("externalId", "externalId", RAW, None),
+        ("groups", "groups", OPT_LIST, Group),
+        ("id", "id", RAW, None),
+    ],
+    SendText: [("text", "text", RAW, None), ("hidden", "hidden", RAW, None)],
+    Send: [
+        ("name", "name", RAW, None),
+        ("notes", "notes", RAW, None),
+        ("type", "type", ENUM, SendType),
+        ("text", "text", OPT_NESTED, SendText),
+        ("file", "file", RAW, None),
+        ("maxAccessCount", "maxAccessCount", OPT_INT, None),
+        (
+            "deletionDate",
+            "deletionDate",
+            CALL,
+            lambda v: _parse_send_date(v, "deletion"),
+        ),
+        (
+            "expirationDate",
+            "expirationDate",
+            CALL,
+            lambda v: _parse_send_date(v, "expiration"),
+        ),
+        ("password", "password", RAW, None),
+        ("disabled", "disabled", RAW, None),
+        ("hideEmail", "hideEmail", RAW, None),
+    ],
+}
+DECODERS = compile_decoders(DECODER_SPECS, check_dict={OrgMember: False})
+decode_item = DECODERS[Item]
+
+
+class _LazyField:
+    """Non-data descriptor decoding one nested field of a `LazyItem` from its
+    payload. The value is stored in the instance `__dict__`, which shadows
+    the descriptor, so later reads are plain attribute lookups."""
+
+    def __init__(self, name: str, decode: Callable[[Any], Any], kind: type = dict):
+        self.name = name
+        self.decode = decode
+        self.kind = kind
+
+    def load(self, raw: dict) -> Any:
+        value = raw.get(self.name)
+        try:
+            return self.decode(value) if isinstance(value, self.kind) else None
+        except Exception:
+            return None
+
+    def __get__(self, item: "LazyItem", owner: type = None) -> Any:
+        if item is None:
+            return self
+        value = item._raw.get(self.name)
+        try:
+            value = self.decode(value) if isinstance(value, self.kind) else None
+        except Exception:
+            value = None
+        item.__dict__[self.name] = value
+        return value
+
+
+_LAZY_FIELDS = frozenset(["fields", "login", "secureNote", "card", "identity"])
+_LAZY_SCALARS = [spec for spec in DECODER_SPECS[Item] if spec[0] not in _LAZY_FIELDS]
+
+_decode_item_scalars = compile_decoder(dict, _LAZY_SCALARS, DECODERS)
+
+
+def _decode_fields(fields: list) -> List[Field]:
+    return [DECODERS[Field](f) for f in fields]
+
+
+class LazyItem(Item):
+    """`Item` that keeps the payload it was decoded from and only decodes
+    `login`, `secureNote`, `card`, `identity` and `fields` when they are
+    first accessed, caching the result. The other fields are decoded up
+    front, exactly as `decode_item` does, and the two compare equal.
+
+    Reading fields, comparing and `repr` leave the item unmodified. It is
+    `modified` once a field is assigned or a nested object that was read
+    no longer equals a fresh decode of the payload (it was changed in
+    place). Until then `to_dict` returns the original payload itself rather
+    than building a new one; do not mutate it.
+
+    Built from keyword field values instead of a payload, as
+    `dataclasses.replace` does, a `LazyItem` is an ordinary decoded item
+    without a payload and always `modified`.
+    """
+
+    fields = _LazyField("fields", _decode_fields, list)
+    login = _LazyField("login", DECODERS[Login])
+    secureNote = _LazyField("secureNote", DECODERS[SecureNote])
+    card = _LazyField("card", DECODERS[Card])
+    identity = _LazyField("identity", DECODERS[Identity])
+
+    def __init__(self, raw: dict = None, **values):
+        if raw is None:
+            object.__setattr__(self, "_raw", None)
+            super().__init__(**values)
+            return
+        if values:
+            raise TypeError("LazyItem takes a payload or field values, not both")
+        state = _decode_item_scalars(raw)
+        state["_raw"] = raw
+        state["_modified"] = False
+        object.__setattr__(self, "__dict__", state)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self.__dict__["_modified"] = True
+        super().__setattr__(name, value)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Item):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(Item)
+        )
+
+    __hash__ = None
+
+    @property
+    def modified(self) -> bool:
+        if self._modified or self._raw is None:
+            return True
+        state = self.__dict__
+        return any(
+            state[name] != getattr(LazyItem, name).load(self._raw)
+            for name in _LAZY_FIELDS.intersection(state)
+        )
+
+    def to_dict(self) -> dict:
+        if self.modified:
+            return super().to_dict()
+        return self._raw
+
+
+BW_SERVER_URL = os.environ.get("BW_SERVER_URL", "http://localhost:8087")
+
+# Batch login lookups of at least this share of the vault's items read the
+# item list once instead of each item
+LIST_LOOKUP_FRACTION = 0.1
+ITEMS_URL = "/list/object/items"
+
+logger = logging.getLogger(__name__)
+
+
+def _list_url(path: str, **query) -> str:
+    """`path` with the non-None `query` parameters URL-encoded."""
+    query = {key: value for key, value in query.items() if value is not None}
+    return f"{path}?{urlencode(query)}" if query else path
+
+
+def _items_url(
+    search_query: str = None,
+    folder_id: str = None,
+    collection_id: str = None,
+    organization_id: str = None,
+    url: str = None,
+    trash: bool = False,
+) -> str:
+    """The item list route, filtered on the server by `bw serve`."""
+    return _list_url(
+        ITEMS_URL,
+        search=search_query,
+        folderid=folder_id,
+        collectionid=collection_id,
+        organizationid=organization_id,
+        url=url,
+        trash="true" if trash else None,
+    )
+
+
+# Response decoding, shared by VaultClient and AsyncVaultClient
+def _check_data(response: Any) -> None:
+    if not isinstance(response, dict) or "data" not in response:
+        raise Exception("Invalid server response: Missing or invalid 'data' field")
+
+
+def _value_from_response(response: dict, onlyValue: bool) -> Any:
+    if onlyValue:
+        return response["data"]["data"]
+    else:
+        return response
+
+
+def _value_or_message(response: dict, onlyValue: bool) -> Any:
+    if onlyValue:
+        try:
+            return response["data"]["data"]
+        except KeyError:
+            return response["message"]
+    else:
+        return response
+
+
+def _lookup_value(response: Any) -> Any:
+    """The value in a `/object/<field>/<id>` response, or `MISSING`."""
+    if isinstance(response, dict) and response.get("success"):
+        data = response.get("data")
+        if isinstance(data, dict) and data.get("data") is not None:
+            return data["data"]
+    return MISSING
+
+
+def _batch_result(ids: List[str], outcomes: list, elapsed: float) -> BatchResult:
+    """Sort per-id responses (or the exceptions they raised) into a result."""
+    result = BatchResult(elapsed=elapsed)
+    for _id, outcome in zip(ids, outcomes):
+        if isinstance(outcome, BaseException):
+            result.failed[_id] = outcome
+            continue
+        value = _lookup_value(outcome)
+        if value is MISSING:
+            result.missing.append(_id)
+        else:
+            result.values[_id] = value
+    return result
+
+
+def _use_list(ids: List[str], vault_size: Optional[int]) -> bool:
+    """Whether looking up `ids` should read the whole item list."""
+    if not ids or vault_size is None:
+        return False
+    return len(ids) >= vault_size * LIST_LOOKUP_FRACTION
+
+
+def _login_values(raw_items: Iterable[dict], key: str, ids: List[str]) -> dict:
+    """`{id: login[key]}` for those of `ids` found in `raw_items`."""
+    wanted = set(ids)
+    found = {}
+    for raw in raw_items:
+        _id = raw.get("id")
+        if _id in wanted:
+            value = (raw.get("login") or {}).get(key)
+            if value is not None:
+                found[_id] = value
+    return {_id: found[_id] for _id in ids if _id in found}
+
+
+def _error_message(body: bytes, default: str) -> str:
+    """The `message` of a JSON error response, else `default`."""
+    try:
+        return loads(body).get("message") or default
+    except (ValueError, AttributeError):
+        return default
+
+
+def _feed_list(stream: JsonArrayStream, chunk: Optional[bytes]) -> List[dict]:
+    """`stream.feed(chunk)`, or `stream.close()` for None. If the array
+    cannot be read, raise the server's `message` when it reported a failure
+    with a success status."""
+    try:
+        return stream.close() if chunk is None else stream.feed(chunk)
+    except ValueError as e:
+        if stream.envelope.get("success") is False:
+            raise Exception(stream.envelope.get("message") or "Request failed")
+        raise Exception(f"Invalid server response: {e}") from e
+
+
+def _iter_list(response: Response, chunk_size: int) -> Iterator[dict]:
+    """Stream the `data.data` array of a list response."""
+    if response.status_code != 200:
+        raise Exception(_error_message(response.content, response.reason))
+    stream = JsonArrayStream(("data", "data"))
+    for chunk in response.iter_content(chunk_size):
+        yield from _feed_list(stream, chunk)
+    yield from _feed_list(stream, None)
+
+
+@contextmanager
+def _open_download(dest) -> Iterator[BinaryIO]:
+    """Yield `dest` if it is a binary file; for a path, yield a `.part` file
+    that replaces `dest` if the block completes and is removed if not."""
+    if hasattr(dest, "write"):
+        yield dest
+        return
+    part = f"{os.fspath(dest)}.part"
+    try:
+        with open(part, "wb") as f:
+            yield f
+        os.replace(part, dest)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+
+
+def _item_from_response(response: dict) -> Item:
+    if response["data"]["object"] == "item":
+        return decode_item(response.get("data"))
+    else:
+        raise Exception("Not an item")
+
+
+def _items_from_response(response: dict) -> List[Item]:
+    if response["data"]["object"] == "list":
+        items = []
+        for item in response["data"]["data"]:
+            items.append(decode_item(item))
+        return items
+    else:
+        raise Exception("Not a list")
+
+
+def _lazy_items_from_response(response: dict) -> List[LazyItem]:
+    if response["data"]["object"] == "list":
+        return [LazyItem(item) for item in response["data"]["data"]]
+    else:
+        raise Exception("Not a list")
+
+
+def _folder_from_response(response: dict) -> Folder:
+    if response["data"]["object"] == "folder":
+        return DECODERS[Folder](response.get("data"))
+    else:
+        raise Exception("Not a folder")
+
+
+def _folders_from_response(response: dict) -> List[Folder]:
+    folders = []
+    for folder in response["data"]["data"]:
+        folders.append(DECODERS[Folder](folder))
+    return folders
+
+
+def _send_from_response(response: dict) -> Send:
+    _check_data(response)
+    try:
+        return DECODERS[Send](response["data"])
+    except KeyError:
+        raise Exception("Error creating Send object")
+
+
+def _sends_from_response(response: dict) -> List[Send]:
+    _check_data(response)
+    sends = []
+    for send in response["data"]["data"]:
+        sends.append(DECODERS[Send](send))
+    return sends
+
+
+def _collection_from_response(response: dict) -> Collection:
+    _check_data(response)
+    try:
+        return DECODERS[Collection](response["data"])
+    except KeyError:
+        raise Exception("Error creating Collection object")
+
+
+def _collections_from_response(response: dict) -> List[Collection]:
+    _check_data(response)
+    collections = []
+    for collection in response["data"]["data"]:
+        collections.append(DECODERS[Collection](collection))
+    return collections
+
+
+def _organizations_from_response(response: dict) -> list:
+    _check_data(response)
+    # we don't have an Organization class
+    return list(response["data"]["data"])
+
+
+def _org_members_from_response(response: dict) -> List[OrgMember]:
+    _check_data(response)
+    members = []
+    for member in response["data"]["data"]:
+        members.append(DECODERS[OrgMember](member))
+    return members
+
+
+class VaultClient:
+    """Client for the Vault Management API exposed by `bw serve`.
+
+    Requests go through one pooled `requests.Session`, so connections to the
+    server are kept alive and reused instead of being opened per call. A
+    client can be shared between worker threads; `pool_maxsize` should be at
+    least the number of threads issuing requests concurrently.
+
+    Pass an `LRUCache` as `cache` to serve repeated `get_item`, `get_folder`,
+    `get_send` and `get_org_collection` calls from memory. Writes made
+    through the same client invalidate the affected entries and `sync`
+    clears the cache. Cached objects are shared between callers.
+
+    Pass a `Metrics` registry as `metrics` to record the latency, size and
+    status of every request and the time spent decoding responses.
+
+    `timeout` is a `(connect, read)` pair (or one value for both) applied to
+    every attempt. `deadline` caps the total seconds a request may take,
+    retries included; the HTTP helpers also take a `deadline=` argument and
+    `with deadline(seconds):` bounds all requests made inside the block.
+    Failed GETs are retried as `retry` allows; other methods never are.
+
+    With `singleflight=True`, concurrent identical GETs (same URL, no extra
+    headers) share one request, and concurrent reads of the same model
+    (`get_item(x)`, `get_items()`, ...) also share the decoded result, which
+    is then shared between callers the same way cached objects are.
+
+    With a `SessionManager` as `session_manager`, a request that fails
+    because the vault is locked unlocks it and is sent once more; file
+    uploads are not replayed.
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        headers: dict = None,
+        cache: LRUCache = None,
+        metrics: Metrics = None,
+        timeout: Timeout = (5.0, 60.0),
+        deadline: float = None,
+        retry: RetryPolicy = None,
+        singleflight: bool = False,
+        session_manager: SessionManager = None,
+    ):
+        self.base_url = (base_url or BW_SERVER_URL).rstrip("/")
+        self.pool_maxsize = pool_maxsize
+        self.cache = cache
+        self.metrics = metrics
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry = retry or RetryPolicy()
+        self.singleflight = SingleFlight() if singleflight else None
+        self.vault_size: Optional[int] = None
+        self.session_manager = session_manager
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        if headers:
+            self.session.headers.update(headers)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "VaultClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _url(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path}"
+
+    def _cached(self, key: tuple, fetch: Callable[[], Any]) -> Any:
+        if self.cache is None:
+            return fetch()
+        value = self.cache.get(key)
+        if value is MISSING:
+            version = self.cache.version
+            value = fetch()
+            self.cache.set(key, value, version)
+        return value
+
+    def _invalidate(self, *key) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(key)
+
+    def _decode(self, decode: Callable[..., Any], response: dict, *args) -> Any:
+        if self.metrics is None:
+            return decode(response, *args)
+        start = time.perf_counter()
+        try:
+            return decode(response, *args)
+        finally:
+            self.metrics.observe_decode(
+                decode.__name__[1 : -len("_from_response")],
+                time.perf_counter() - start,
+            )
+
+    def _deadline(self, seconds: Optional[float]) -> Optional[Deadline]:
+        return Deadline.earliest(
+            Deadline(seconds) if seconds is not None else None,
+            Deadline(self.deadline) if self.deadline is not None else None,
+            current_deadline(),
+        )
+
+    # HTTP methods
+    def _request(
+        self,
+        method: str,
+        url: str,
+        deadline: float = None,
+        retry: RetryPolicy = None,
+        **kwargs,
+    ) -> Response:
+        manager = self.session_manager
+        if manager is None or url in LOCK_ROUTES:
+            return self._retrying(method, url, deadline, retry, **kwargs)
+        seen = manager.generation
+        response = self._retrying(method, url, deadline, retry, **kwargs)
+        # only error bodies are read here, so streamed responses stay unread
+        if (
+            response.status_code >= 400
+            and isinstance(kwargs.get("data"), (bytes, type(None)))
+            and is_locked_body(response.status_code, response.content)
+        ):
+            logger.debug("Vault is locked; unlocking to replay %s %s", method, url)
+            response.close()
+            manager.unlock(self, seen)
+            response = self._retrying(method, url, deadline, retry, **kwargs)
+        return response
+
+    def _retrying(
+        self,
+        method: str,
+        url: str,
+        deadline: Optional[float],
+        retry: Optional[RetryPolicy],
+        **kwargs,
+    ) -> Response:
+        url = self._url(url)
+        budget = self._deadline(deadline)
+        retry = retry or self.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            kwargs["timeout"] = attempt_timeout(self.timeout, budget)
+            try:
+                response = self._attempt(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if isinstance(e, requests.Timeout) and self.metrics is not None:
+                    self.metrics.observe_timeout(method, url)
+                delay = retry.delay(attempt - 1)
+                if not retry.should_retry(method, attempt, budget, delay):
+                    raise
+            else:
+                if response.status_code not in retry.statuses:
+                    return response
+                delay = retry.delay(attempt - 1)
+                if not retry.should_retry(method, attempt, budget, delay):
+                    return response
+                response.close()
+            logger.debug("Retrying %s %s in %.3fs", method, url, delay)
+            if self.metrics is not None:
+                self.metrics.observe_retry(method, url)
+            time.sleep(delay)
+
+    def _attempt(self, method: str, url: str, **kwargs) -> Response:
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            logger.debug("%s %s failed after %.3fs: %r", method, url, elapsed, e)
+            if self.metrics is not None:
+                self.metrics.observe_request(
+                    method, url, None, elapsed, error=type(e).__name__
+                )
+            raise
+        finally:
+            if method != "GET" and self.singleflight is not None:
+                self.singleflight.forget()  # later reads must see this write
+        elapsed = time.perf_counter() - start
+        logger.debug("%s %s -> %s in %.3fs", method, url, response.status_code, elapsed)
+        if self.metrics is not None:
+            if kwargs.get("stream"):
+                size = int(response.headers.get("Content-Length") or 0)
+            else:
+                size = len(response.content)
+            self.metrics.observe_request(
+                method, url, response.status_code, elapsed, size
+            )
+        return response
+
+    def get(self, url: str, headers=None, deadline: float = None) -> dict:
+        def fetch():
+            return loads(self._request("GET", url, deadline, headers=headers).content)
+
+        if self.singleflight is None or headers is not None:
+            return fetch()
+        return self._coalesce(("GET", url), fetch, deadline)
+
+    def post(
+        self, url: str, data: dict = None, headers=None, deadline: float = None
+    ) -> dict:
+        return self._send("POST", url, data, headers, deadline)
+
+    def post_file(
+        self,
+        url: str,
+        file: Union[str, BinaryIO],
+        headers=None,
+        deadline: float = None,
+        filename: str = None,
+        length: int = None,
+    ) -> Response:
+        return self._request_file(
+            "POST", url, file, headers, deadline, filename, length
+        )
+
+    def put(self, url: str, data: dict, headers=None, deadline: float = None) -> dict:
+        return self._send("PUT", url, data, headers, deadline)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Union[dict, bytes, None],
+        headers: Optional[dict],
+        deadline: Optional[float],
+        retry: RetryPolicy = None,
+    ) -> dict:
+        """Send `data` as a JSON body, encoded once up front unless it is
+        already `bytes`."""
+        if data is not None:
+            headers = {"Content-Type": JSON_CONTENT_TYPE, **(headers or {})}
+            if not isinstance(data, bytes):
+                data = dumps(data)
+        response = self._request(
+            method, url, deadline, retry, data=data, headers=headers
+        )
+        return loads(response.content)
+
+    def put_file(
+        self,
+        url: str,
+        file: Union[str, BinaryIO],
+        headers=None,
+        deadline: float = None,
+        filename: str = None,
+        length: int = None,
+    ) -> Response:
+        return self._request_file("PUT", url, file, headers, deadline, filename, length)
+
+    def _request_file(
+        self,
+        method: str,
+        url: str,
+        file: Union[str, BinaryIO],
+        headers: Optional[dict],
+        deadline: Optional[float],
+        filename: Optional[str],
+        length: Optional[int],
+    ) -> Response:
+        """Upload `file` (a path or a binary file) as a streamed multipart
+        body, one chunk at a time."""
+        with open_upload(file) as f:
+            body = MultipartFile(f, filename or upload_name(file), length=length)
+            headers = {**(headers or {}), "Content-Type": body.content_type}
+            return self._request(method, url, deadline, data=body, headers=headers)
+
+    def delete(self, url: str, headers=None, deadline: float = None) -> dict:
+        return loads(self._request("DELETE", url, deadline, headers=headers).content)
+
+    def _coalesce(self, key: tuple, fetch: Callable[[], Any], deadline=None) -> Any:
+        budget = self._deadline(deadline)
+        timeout = budget.remaining() if budget is not None else None
+        return self.singleflight.do(key, fetch, timeout)
+
+    def _fetch(self, url: str, decode: Callable[..., Any]) -> Any:
+        """GET `url` and build models from the response with `decode`."""
+
+        def fetch():
+            return self._decode(decode, self.get(url))
+
+        if self.singleflight is None:
+            return fetch()
+        return self._coalesce(("GET", url, decode), fetch)
+
+    ### Lock & Unlock ###
+    def lock(self) -> dict:
+        return self.post("/lock")
+
+    def unlock(self, password: str) -> dict:
+        return self.post("/unlock", data={"password": password})
+
+    ### Miscellaneous ###
+    def sync(self) -> dict:
+        try:
+            return self.post("/sync")
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+
+    def status(self) -> dict:
+        return self.get("/status")
+
+    def get_generate(self) -> dict:
+        return self.get("/generate")
+
+    def get_template(self, template: str) -> dict:
+        return self.get(f"/object/template/{template}")
+
+    def get_fingerprint(self) -> dict:
+        return self.get("/object/fingerprint/me")
+
+    ### Vault Items ###
+    def get_item(self, _id: str) -> Item:
+        return self._cached(
+            ("item", _id),
+            lambda: self._fetch(f"/object/item/{_id}", _item_from_response),
+        )
+
+    def add_item(self, item: Item) -> Item:
+        return self._decode(
+            _item_from_response, self.post("/object/item", data=item.to_dict())
+        )
+
+    def edit_item(self, _id: str, item: Item) -> Item:
+        try:
+            return self._decode(
+                _item_from_response,
+                self.put(f"/object/item/{_id}", data=item.to_dict()),
+            )
+        finally:
+            self._invalidate("item", _id)
+
+    def delete_item(self, _id: str) -> dict:
+        try:
+            return self.delete(f"/object/item/{_id}")
+        finally:
+            self._invalidate("item", _id)
+
+    def restore_item(self, _id: str) -> dict:
+        try:
+            return self.post(f"/restore/item/{_id}")
+        finally:
+            self._invalidate("item", _id)
+
+    def get_items(
+        self,
+        lazy: bool = False,
+        search_query: str = None,
+        folder_id: str = None,
+        collection_id: str = None,
+        organization_id: str = None,
+        url: str = None,
+        trash: bool = False,
+    ) -> List[Item]:
+        """Items matching the filters, which the server applies: `search_query`
+        over names and more, items in a folder, collection or organization,
+        items with a login URI matching `url`, and with `trash` deleted
+        items. With `lazy`, returns `LazyItem`s, which is cheaper when most
+        of their logins, cards etc. are never looked at."""
+        list_url = _items_url(
+            search_query, folder_id, collection_id, organization_id, url, trash
+        )
+        if lazy:
+            items = self._fetch(list_url, _lazy_items_from_response)
+        else:
+            items = self._fetch(list_url, _items_from_response)
+        if list_url == ITEMS_URL:
+            self.vault_size = len(items)
+        return items
+
+    def iter_items(
+        self,
+        chunk_size: int = 65536,
+        lazy: bool = False,
+        search_query: str = None,
+        folder_id: str = None,
+        collection_id: str = None,
+        organization_id: str = None,
+        url: str = None,
+        trash: bool = False,
+    ) -> Iterator[Item]:
+        """Like `get_items`, but decodes the response as it arrives and
+        yields one `Item` at a time, so memory does not grow with the vault.
+        """
+        decode = LazyItem if lazy else decode_item
+        raw_items = self.iter_raw_items(
+            chunk_size,
+            search_query,
+            folder_id,
+            collection_id,
+            organization_id,
+            url,
+            trash,
+        )
+        for item in raw_items:
+            yield decode(item)
+
+    def iter_raw_items(
+        self,
+        chunk_size: int = 65536,
+        search_query: str = None,
+        folder_id: str = None,
+        collection_id: str = None,
+        organization_id: str = None,
+        url: str = None,
+        trash: bool = False,
+    ) -> Iterator[dict]:
+        """Stream the item list as the raw dicts returned by the server."""
+        list_url = _items_url(
+            search_query, folder_id, collection_id, organization_id, url, trash
+        )
+        count = 0
+        with self._request("GET", list_url, stream=True) as response:
+            for raw in _iter_list(response, chunk_size):
+                count += 1
+                yield raw
+        if list_url == ITEMS_URL:
+            self.vault_size = count
+
+    def add_items(self, items: Iterable[Item], max_workers: int = None) -> BulkReport:
+        """Create `items` concurrently; `max_workers` defaults to the pool size."""
+        return run_bulk(self.add_item, items, max_workers or self.pool_maxsize)
+
+    def edit_items(
+        self, items: Iterable[Union[Item, Tuple[str, Item]]], max_workers: int = None
+    ) -> BulkReport:
+        """Edit `items` concurrently, given as `Item`s or `(id, Item)` pairs."""
+
+        def edit(x):
+            if isinstance(x, tuple):
+                return self.edit_item(*x)
+            return self.edit_item(x.id, x)
+
+        return run_bulk(edit, items, max_workers or self.pool_maxsize)
+
+    def delete_items(
+        self, ids: Iterable[Union[str, Item]], max_workers: int = None
+    ) -> BulkReport:
+        """Delete items concurrently, given as ids or `Item`s."""
+
+        def remove(x):
+            response = self.delete_item(x if isinstance(x, str) else x.id)
+            if not response.get("success", True):
+                raise Exception(response.get("message", "Error deleting item"))
+            return response
+
+        return run_bulk(remove, ids, max_workers or self.pool_maxsize)
+
+    ### Attachments & Fields ###
+    def add_attachment(
+        self,
+        _id: str,
+        file: Union[str, BinaryIO],
+        filename: str = None,
+        length: int = None,
+    ) -> Response:
+        """Attach `file`, a path or a binary file object, to item `_id`. The
+        file is streamed; `length` is only needed for unsized streams."""
+        try:
+            return self.post_file(
+                f"/object/attachment?itemid={_id}",
+                file,
+                filename=filename,
+                length=length,
+            )
+        finally:
+            self._invalidate("item", _id)
+
+    def get_attachment(self, _id: str, attachmentId: str) -> bytes:
+        """The attachment's content, in memory; see `download_attachment`."""
+        buffer = io.BytesIO()
+        self.download_attachment(_id, attachmentId, buffer)
+        return buffer.getvalue()
+
+    def download_attachment(
+        self,
+        _id: str,
+        attachmentId: str,
+        dest: Union[str, os.PathLike, BinaryIO],
+        chunk_size: int = 65536,
+    ) -> int:
+        """Stream an attachment into `dest` in `chunk_size` pieces and return
+        the number of bytes written. `dest` is a binary file object or a
+        path; a path is written through a `.part` file that only replaces
+        `dest` once the download is complete."""
+        with self._request(
+            "GET",
+            f"/object/attachment/{attachmentId}?itemid={_id}",
+            headers={"Accept": "*/*"},
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(_error_message(response.content, response.reason))
+            written = 0
+            with _open_download(dest) as f:
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+            return written
+
+    def add_attachments(
+        self,
+        uploads: Iterable[Tuple[str, Union[str, BinaryIO]]],
+        max_workers: int = None,
+    ) -> BulkReport:
+        """Upload `(item id, file)` pairs concurrently."""
+        return run_bulk(
+            lambda upload: self.add_attachment(*upload),
+            uploads,
+            max_workers or self.pool_maxsize,
+        )
+
+    def download_attachments(
+        self,
+        downloads: Iterable[Tuple[str, str, Union[str, os.PathLike, BinaryIO]]],
+        max_workers: int = None,
+    ) -> BulkReport:
+        """Download `(item id, attachment id, dest)` triples concurrently; the
+        results are the byte counts."""
+        return run_bulk(
+            lambda download: self.download_attachment(*download),
+            downloads,
+            max_workers or self.pool_maxsize,
+        )
+
+    def delete_attachment(self, _id: str, attachmentId: str) -> dict:
+        try:
+            return self.delete(f"/object/attachment/{attachmentId}?itemid={_id}")
+        finally:
+            self._invalidate("item", _id)
+
+    def get_username(self, _id: str, onlyValue: bool = False) -> Union[dict, Response]:
+        return _value_from_response(self.get(f"/object/username/{_id}"), onlyValue)
+
+    def get_password(self, _id: str, onlyValue: bool = False) -> Union[dict, Response]:
+        return _value_from_response(self.get(f"/object/password/{_id}"), onlyValue)
+
+    def get_totp(self, _id: str, onlyValue: bool = False) -> Union[dict, Response]:
+        return _value_or_message(self.get(f"/object/totp/{_id}"), onlyValue)
+
+    def get_notes(self, _id: str, onlyValue: bool = False) -> Union[dict, Response]:
+        return _value_or_message(self.get(f"/object/notes/{_id}"), onlyValue)
+
+    def get_exposed(self, _id: str, onlyValue: bool = False) -> Union[dict, Response]:
+        return _value_from_response(self.get(f"/object/exposed/{_id}"), onlyValue)
+
+    def get_usernames(
+        self, ids: Iterable[str], max_workers: int = None, from_list: bool = None
+    ) -> BatchResult:
+        """Usernames of many items; see `get_passwords`."""
+        return self._lookup_login("username", ids, max_workers, from_list)
+
+    def get_passwords(
+        self, ids: Iterable[str], max_workers: int = None, from_list: bool = None
+    ) -> BatchResult:
+        """Passwords of many items, as a `BatchResult` keyed by id.
+
+        Duplicate ids are looked up once, with up to `max_workers` (default:
+        the pool size) requests in flight. With `from_list`, all values are
+        read from one streamed `/list/object/items` response instead. That is
+        the default once the ids are `LIST_LOOKUP_FRACTION` of the vault,
+        whose size (`vault_size`) the client learns from its unfiltered item
+        listings; until then ids are looked up one by one.
+        """
+        return self._lookup_login("password", ids, max_workers, from_list)
+
+    def get_totps(self, ids: Iterable[str], max_workers: int = None) -> BatchResult:
+        """Current TOTP codes of many items. Codes are generated by the
+        server, so there is always one request per id."""
+        return self._lookup("totp", list(dict.fromkeys(ids)), max_workers)
+
+    def _lookup(
+        self, kind: str, ids: List[str], max_workers: int = None
+    ) -> BatchResult:
+        report = run_bulk(
+            lambda _id: self.get(f"/object/{kind}/{_id}"),
+            ids,
+            max_workers or self.pool_maxsize,
+        )
+        outcomes = list(report.results)
+        for failure in report.failures:
+            outcomes[failure.index] = failure.error
+        return _batch_result(ids, outcomes, report.elapsed)
+
+    def _lookup_login(
+        self, key: str, ids: Iterable[str], max_workers: int, from_list: bool
+    ) -> BatchResult:
+        ids = list(dict.fromkeys(ids))
+        max_workers = max_workers or self.pool_maxsize
+        if from_list is None:
+            from_list = _use_list(ids, self.vault_size)
+        if not from_list:
+            return self._lookup(key, ids, max_workers)
+        start = time.perf_counter()
+        result = BatchResult()
+        try:
+            result.values = _login_values(self.iter_raw_items(), key, ids)
+        except Exception as e:
+            result.failed = dict.fromkeys(ids, e)
+        else:
+            result.missing = [_id for _id in ids if _id not in result.values]
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    ### Folders ###
+    def add_folder(self, name: str) -> Folder:
+        return self._decode(
+            _folder_from_response, self.post("/object/folder", data={"name": name})
+        )
+
+    def edit_folder(self, _id: str, name: str) -> Folder:
+        try:
+            return self._decode(
+                _folder_from_response,
+                self.put(f"/object/folder/{_id}", data={"name": name}),
+            )
+        finally:
+            self._invalidate("folder", _id)
+
+    def get_folder(self, _id: str) -> Folder:
+        return self._cached(
+            ("folder", _id),
+            lambda: self._fetch(f"/object/folder/{_id}", _folder_from_response),
+        )
+
+    def delete_folder(self, _id: str) -> dict:
+        try:
+            return self.delete(f"/object/folder/{_id}")
+        finally:
+            self._invalidate("folder", _id)
+
+    def get_folders(self) -> List[Folder]:
+        return self._fetch("/list/object/folders", _folders_from_response)
+
+    ### Sends ###
+    def add_send(self, send: Send) -> Send:
+        return self._decode(
+            _send_from_response, self.post("/object/send", data=send.to_dict())
+        )
+
+    def edit_send(self, _id: str, send: Send) -> Send:
+        try:
+            return self._decode(
+                _send_from_response,
+                self.put(f"/object/send/{_id}", data=send.to_dict()),
+            )
+        finally:
+            self._invalidate("send", _id)
+
+    def get_send(self, _id: str) -> Send:
+        return self._cached(
+            ("send", _id),
+            lambda: self._fetch(f"/object/send/{_id}", _send_from_response),
+        )
+
+    def delete_send(self, _id: str) -> dict:
+        try:
+            return self.delete(f"/object/send/{_id}")
+        finally:
+            self._invalidate("send", _id)
+
+    def get_sends(self) -> List[Send]:
+        return self._fetch("/list/object/send", _sends_from_response)
+
+    def remove_password(self, _id: str) -> dict:
+        try:
+            return self.post(f"/send/{_id}/remove-password")
+        finally:
+            self._invalidate("send", _id)
+
+    ### Collections & Organizations ### # @TODO: test these
+    def move_item(
+        self, item_id: str, org_id: str, collections: List[str]
+    ) -> dict:  # @TODO: make collections a list of Collection objects
+        try:
+            return self.post(
+                f"/move/{item_id}/{org_id}",
+                data={"collections": collections},
+            )
+        finally:
+            self._invalidate("item", item_id)
+
+    def move_items(
+        self,
+        items: Iterable[Union[str, Item]],
+        org_id: str,
+        collections: List[str],
+        max_workers: int = None,
+        retry: RetryPolicy = None,
+        sync: bool = False,
+    ) -> BulkReport:
+        """Move items, given as ids or `Item`s, into organization `org_id`
+        and `collections`, at most `max_workers` (default: the pool size) at
+        a time.
+
+        A move that fails with a connection error, a timeout or a 502/503/504
+        is retried under `retry`, which defaults to the client's policy with
+        POST allowed; a timed out move may have been applied, so its retry
+        can then fail. With `sync`, `sync()` is called once after the moves.
+        """
+        if retry is None:
+            retry = replace(self.retry, methods=self.retry.methods | {"POST"})
+        data = dumps({"collections": collections})
+
+        def move(x):
+            item_id = x if isinstance(x, str) else x.id
+            try:
+                response = self._send(
+                    "POST", f"/move/{item_id}/{org_id}", data, None, None, retry
+                )
+            finally:
+                self._invalidate("item", item_id)
+            if not response.get("success", True):
+                raise Exception(response.get("message", "Error moving item"))
+            return response
+
+        report = run_bulk(move, items, max_workers or self.pool_maxsize)
+        if sync:
+            self.sync()
+        return report
+
+    def add_org_collection(self, org_id: str, collection: Collection) -> Collection:
+        response = self.post(
+            f"/object/org-collection?organizationId={org_id}",
+            # @TODO: organizationId might be organizationid
+            data=collection.to_dict(),
+        )
+        return self._decode(_collection_from_response, response)
+
+    def edit_org_collection(
+        self, org_id: str, collection_id: str, collection: Collection
+    ) -> Collection:
+        try:
+            response = self.put(
+                f"/object/org-collection/{collection_id}?organizationId={org_id}",
+                # @TODO: organizationId might be organizationid
+                data=collection.to_dict(),
+            )
+            return self._decode(_collection_from_response, response)
+        finally:
+            self._invalidate("org-collection", org_id, collection_id)
+
+    def get_org_collection(self, org_id: str, collection_id: str) -> Collection:
+        def fetch():
+            return self._fetch(
+                f"/object/org-collection/{collection_id}?organizationId={org_id}",
+                # @TODO: organizationId might be organizationid
+                _collection_from_response,
+            )
+
+        return self._cached(("org-collection", org_id, collection_id), fetch)
+
+    def delete_org_collection(self, org_id: str, collection_id: str) -> dict:
+        try:
+            return self.delete(
+                f"/object/org-collection/{collection_id}?organizationId={org_id}"
+                # @TODO: organizationId might be organizationid
+            )
+        finally:
+            self._invalidate("org-collection", org_id, collection_id)
+
+    def get_org_collections(self, org_id: str) -> List[Collection]:
+        return self._fetch(
+            f"/list/object/org-collections?organizationId={org_id}",
+            # @TODO: organizationId might be organizationid
+            _collections_from_response,
+        )
+
+    def get_collections(self, search_query: str = None) -> List[Collection]:
+        url = _list_url("/list/object/collections", search=search_query or None)
+        return self._fetch(url, _collections_from_response)
+
+    def get_organizations(self, search_query: str = None) -> list:
+        url = _list_url("/list/object/organizations", search=search_query or None)
+        return self._fetch(url, _organizations_from_response)
+
+    def get_org_members(self, org_id: str) -> List[OrgMember]:
+        return self._fetch(
+            f"/list/object/org-members/{org_id}", _org_members_from_response
+        )
+
+    def confirm_org_member(self, org_id: str, member_id: str) -> dict:
+        return self.post(
+            f"/confirm/org-member/{member_id}?organizationId={org_id}"
+            # @TODO: organizationId might be organizationid
+        )
+
+    def confirm_org_members(
+        self,
+        org_id: str,
+        members: Iterable[Union[str, OrgMember]],
+        max_workers: int = None,
+    ) -> BulkReport:
+        """Confirm members, given as ids or `OrgMember`s, concurrently."""
+
+        def confirm(x):
+            member_id = x if isinstance(x, str) else x.id
+            response = self.confirm_org_member(org_id, member_id)
+            if not response.get("success", True):
+                raise Exception(response.get("message", "Error confirming member"))
+            return response
+
+        return run_bulk(confirm, members, max_workers or self.pool_maxsize)
+
+
+_default_client: Optional[VaultClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> VaultClient:
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = VaultClient()
+    return _default_client
+
+
+def set_default_client(client: VaultClient) -> None:
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
 # HTTP methods
 def get(url: str, headers=None) -> dict:
-    if headers is None:
-        headers = {}
-    response = requests.get(url, headers=headers)
-    return response.json()
+    return get_default_client().get(url, headers=headers)
 
 
 def post(url: str, data: dict = None, headers=None) -> dict:
-    if headers is None:
-        headers = {}
-    response = requests.post(url, json=data, headers=headers)
-    return response.json()
+    return get_default_client().post(url, data=data, headers=headers)
 
 
 def post_file(url: str, file: str, headers=None) -> Response:
-    if headers is None:
-        headers = {}
-    with open(file, "rb") as f:
-        response = requests.post(url, files=f, headers=headers)
-    return response  # .json()
+    return get_default_client().post_file(url, file, headers=headers)
 
 
 def put(url: str, data: dict, headers=None) -> dict:
-    if headers is None:
-        headers = {}
-    response = requests.put(url, json=data, headers=headers)
-    return response.json()
+    return get_default_client().put(url, data, headers=headers)
 
 
 def put_file(url: str, file: str, headers=None):  # @TODO: add return type
-    if headers is None:
-        headers = {}
-    with open(file, "rb") as f:
-        response = requests.put(url, files=f, headers=headers)
-    return response  # .json()
+    return get_default_client().put_file(url, file, headers=headers)
 
 
 def delete(url: str, headers=None) -> dict:
-    if headers is None:
-        headers = {}
-    response = requests.delete(url, headers=headers)
-    return response.json()
+    return get_default_client().delete(url, headers=headers)
 
 
 # Other functions
@@ -914,356 +2240,302 @@ def print_json(data: dict) -> None:
 
 ### Lock & Unlock ###
 def lock() -> dict:
-    return post(f"{BW_SERVER_URL}/lock")
+    return get_default_client().lock()
 
 
 def unlock(password: str) -> dict:
-    return post(f"{BW_SERVER_URL}/unlock", data={"password": password})
+    return get_default_client().unlock(password)
 
 
 ### Miscellaneous ###
 def sync() -> dict:
-    return post(f"{BW_SERVER_URL}/sync")
+    return get_default_client().sync()
 
 
 def status() -> dict:
-    return get(f"{BW_SERVER_URL}/status")
+    return get_default_client().status()
 
 
 def get_generate() -> dict:
-    return get(f"{BW_SERVER_URL}/generate")
+    return get_default_client().get_generate()
 
 
 def get_template(template: str) -> dict:
-    return get(f"{BW_SERVER_URL}/object/template/{template}")
+    return get_default_client().get_template(template)
 
 
 def get_fingerprint() -> dict:
-    return get(f"{BW_SERVER_URL}/object/fingerprint/me")
+    return get_default_client().get_fingerprint()
 
 
 ### Vault Items ###
 def get_item(_id: str) -> Item:
-    response = get(f"{BW_SERVER_URL}/object/item/{_id}")
-    if response["data"]["object"] == "item":
-        item = Item.from_dict(response.get("data"))
-        return item
-    else:
-        raise Exception("Not an item")
+    return get_default_client().get_item(_id)
 
 
 def add_item(item: Item) -> Item:
-    response = post(f"{BW_SERVER_URL}/object/item", data=item.to_dict())
-    if response["data"]["object"] == "item":
-        item = Item.from_dict(response.get("data"))
-        return item
-    else:
-        raise Exception("Not an item")
+    return get_default_client().add_item(item)
 
 
 def edit_item(_id: str, item: Item) -> Item:
-    response = put(f"{BW_SERVER_URL}/object/item/{_id}", data=item.to_dict())
-    if response["data"]["object"] == "item":
-        item = Item.from_dict(response.get("data"))
-        return item
-    else:
-        raise Exception("Not an item")
+    return get_default_client().edit_item(_id, item)
 
 
 def delete_item(_id: str) -> dict:
-    return delete(f"{BW_SERVER_URL}/object/item/{_id}")
+    return get_default_client().delete_item(_id)
 
 
 def restore_item(_id: str) -> dict:
-    return post(f"{BW_SERVER_URL}/restore/item/{_id}")
+    return get_default_client().restore_item(_id)
+
+
+def get_items(
+    lazy: bool = False,
+    search_query: str = None,
+    folder_id: str = None,
+    collection_id: str = None,
+    organization_id: str = None,
+    url: str = None,
+    trash: bool = False,
+) -> List[Item]:
+    return get_default_client().get_items(
+        lazy, search_query, folder_id, collection_id, organization_id, url, trash
+    )
 
 
-def get_items() -> List[Item]:
-    response = get(f"{BW_SERVER_URL}/list/object/items")
-    if response["data"]["object"] == "list":
-        items = []
-        for item in response["data"]["data"]:
-            items.append(Item.from_dict(item))
-        return items
-    else:
-        raise Exception("Not a list")
+def iter_items(
+    chunk_size: int = 65536,
+    lazy: bool = False,
+    search_query: str = None,
+    folder_id: str = None,
+    collection_id: str = None,
+    organization_id: str = None,
+    url: str = None,
+    trash: bool = False,
+) -> Iterator[Item]:
+    return get_default_client().iter_items(
+        chunk_size,
+        lazy,
+        search_query,
+        folder_id,
+        collection_id,
+        organization_id,
+        url,
+        trash,
+    )
+
+
+def iter_raw_items(
+    chunk_size: int = 65536,
+    search_query: str = None,
+    folder_id: str = None,
+    collection_id: str = None,
+    organization_id: str = None,
+    url: str = None,
+    trash: bool = False,
+) -> Iterator[dict]:
+    return get_default_client().iter_raw_items(
+        chunk_size, search_query, folder_id, collection_id, organization_id, url, trash
+    )
+
+
+def add_items(items: Iterable[Item], max_workers: int = None) -> BulkReport:
+    return get_default_client().add_items(items, max_workers)
+
+
+def edit_items(
+    items: Iterable[Union[Item, Tuple[str, Item]]], max_workers: int = None
+) -> BulkReport:
+    return get_default_client().edit_items(items, max_workers)
+
+
+def delete_items(
+    ids: Iterable[Union[str, Item]], max_workers: int = None
+) -> BulkReport:
+    return get_default_client().delete_items(ids, max_workers)
 
 
 ### Attachments & Fields ###
-def add_attachment(_id: str, file: str) -> Response:
-    return post_file(f"{BW_SERVER_URL}/object/attachment?itemid={_id}", file)
+def add_attachment(
+    _id: str, file: Union[str, BinaryIO], filename: str = None, length: int = None
+) -> Response:
+    return get_default_client().add_attachment(_id, file, filename, length)
 
 
-def get_attachment(_id: str, attachmentId: str) -> dict:
-    return get(
-        f"{BW_SERVER_URL}/object/attachment/{attachmentId}?itemid={_id}",
-        headers={"Accept": "*/*"},
-    )
+def get_attachment(_id: str, attachmentId: str) -> bytes:
+    return get_default_client().get_attachment(_id, attachmentId)
+
+
+def download_attachment(
+    _id: str,
+    attachmentId: str,
+    dest: Union[str, os.PathLike, BinaryIO],
+    chunk_size: int = 65536,
+) -> int:
+    return get_default_client().download_attachment(_id, attachmentId, dest, chunk_size)
+
+
+def add_attachments(
+    uploads: Iterable[Tuple[str, Union[str, BinaryIO]]], max_workers: int = None
+) -> BulkReport:
+    return get_default_client().add_attachments(uploads, max_workers)
+
+
+def download_attachments(
+    downloads: Iterable[Tuple[str, str, Union[str, os.PathLike, BinaryIO]]],
+    max_workers: int = None,
+) -> BulkReport:
+    return get_default_client().download_attachments(downloads, max_workers)
 
 
 def delete_attachment(_id: str, attachmentId: str) -> dict:
-    return delete(f"{BW_SERVER_URL}/object/attachment/{attachmentId}?itemid={_id}")
+    return get_default_client().delete_attachment(_id, attachmentId)
 
 
 def get_username(_id: str, onlyValue: bool = False) -> Union[dict, Response]:
-    response = get(f"{BW_SERVER_URL}/object/username/{_id}")
-    if onlyValue:
-        return response["data"]["data"]
-    else:
-        return response
+    return get_default_client().get_username(_id, onlyValue)
 
 
 def get_password(_id: str, onlyValue: bool = False) -> Union[dict, Response]:
-    response = get(f"{BW_SERVER_URL}/object/password/{_id}")
-    if onlyValue:
-        return response["data"]["data"]
-    else:
-        return response
+    return get_default_client().get_password(_id, onlyValue)
 
 
 def get_totp(_id: str, onlyValue: bool = False) -> Union[dict, Response]:
-    response = get(f"{BW_SERVER_URL}/object/totp/{_id}")
-    if onlyValue:
-        try:
-            return response["data"]["data"]
-        except KeyError:
-            return response["message"]
-    else:
-        return response
+    return get_default_client().get_totp(_id, onlyValue)
+
+
+def get_usernames(
+    ids: Iterable[str], max_workers: int = None, from_list: bool = None
+) -> BatchResult:
+    return get_default_client().get_usernames(ids, max_workers, from_list)
+
+
+def get_passwords(
+    ids: Iterable[str], max_workers: int = None, from_list: bool = None
+) -> BatchResult:
+    return get_default_client().get_passwords(ids, max_workers, from_list)
+
+
+def get_totps(ids: Iterable[str], max_workers: int = None) -> BatchResult:
+    return get_default_client().get_totps(ids, max_workers)
 
 
 def get_notes(_id: str, onlyValue: bool = False) -> Union[dict, Response]:
-    response = get(f"{BW_SERVER_URL}/object/notes/{_id}")
-    if onlyValue:
-        try:
-            return response["data"]["data"]
-        except KeyError:
-            return response["message"]
-    else:
-        return response
+    return get_default_client().get_notes(_id, onlyValue)
 
 
 def get_exposed(_id: str, onlyValue: bool = False) -> Union[dict, Response]:
-    response = get(f"{BW_SERVER_URL}/object/exposed/{_id}")
-    if onlyValue:
-        return response["data"]["data"]
-    else:
-        return response
+    return get_default_client().get_exposed(_id, onlyValue)
 
 
 ### Folders ###
 def add_folder(name: str) -> Folder:
-    response = post(f"{BW_SERVER_URL}/object/folder", data={"name": name})
-    if response["data"]["object"] == "folder":
-        return Folder.from_dict(response.get("data"))
-    else:
-        raise Exception("Not a folder")
+    return get_default_client().add_folder(name)
 
 
 def edit_folder(_id: str, name: str) -> Folder:
-    response = put(f"{BW_SERVER_URL}/object/folder/{_id}", data={"name": name})
-    if response["data"]["object"] == "folder":
-        return Folder.from_dict(response.get("data"))
-    else:
-        raise Exception("Not a folder")
+    return get_default_client().edit_folder(_id, name)
 
 
 def get_folder(_id: str) -> Folder:
-    response = get(f"{BW_SERVER_URL}/object/folder/{_id}")
-    if response["data"]["object"] == "folder":
-        return Folder.from_dict(response.get("data"))
-    else:
-        raise Exception("Not a folder")
+    return get_default_client().get_folder(_id)
 
 
 def delete_folder(_id: str) -> dict:
-    return delete(f"{BW_SERVER_URL}/object/folder/{_id}")
+    return get_default_client().delete_folder(_id)
 
 
 def get_folders() -> List[Folder]:
-    response = get(f"{BW_SERVER_URL}/list/object/folders")
-    folders = []
-    for folder in response["data"]["data"]:
-        folders.append(Folder.from_dict(folder))
-    return folders
+    return get_default_client().get_folders()
 
 
 ### Sends ###
 def add_send(send: Send) -> Send:
-    send_dict = send.to_dict()
-    response = post(f"{BW_SERVER_URL}/object/send", data=send_dict)
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    try:
-        send_obj = Send.from_dict(response["data"])
-        return send_obj
-    except KeyError:
-        raise Exception("Error creating Send object")
+    return get_default_client().add_send(send)
 
 
 def edit_send(_id: str, send: Send) -> Send:
-    send_dict = send.to_dict()
-    response = put(f"{BW_SERVER_URL}/object/send/{_id}", data=send_dict)
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    try:
-        send_obj = Send.from_dict(response["data"])
-        return send_obj
-    except KeyError:
-        raise Exception("Error creating Send object")
+    return get_default_client().edit_send(_id, send)
 
 
 def get_send(_id: str) -> Send:
-    response = get(f"{BW_SERVER_URL}/object/send/{_id}")
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    try:
-        send_obj = Send.from_dict(response["data"])
-        return send_obj
-    except KeyError:
-        raise Exception("Error creating Send object")
+    return get_default_client().get_send(_id)
 
 
 def delete_send(_id: str) -> dict:
-    return delete(f"{BW_SERVER_URL}/object/send/{_id}")
+    return get_default_client().delete_send(_id)
 
 
 def get_sends() -> List[Send]:
-    response = get(f"{BW_SERVER_URL}/list/object/send")
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    sends = []
-    for send in response["data"]["data"]:
-        sends.append(Send.from_dict(send))
-    return sends
+    return get_default_client().get_sends()
 
 
 def remove_password(_id: str) -> dict:
-    return post(f"{BW_SERVER_URL}/send/{_id}/remove-password")
+    return get_default_client().remove_password(_id)
 
 
 ### Collections & Organizations ### # @TODO: test these
 def move_item(
     item_id: str, org_id: str, collections: List[str]
 ) -> dict:  # @TODO: make collections a list of Collection objects
-    return post(
-        f"{BW_SERVER_URL}/move/{item_id}/{org_id}",
-        data={"collections": collections},
+    return get_default_client().move_item(item_id, org_id, collections)
+
+
+def move_items(
+    items: Iterable[Union[str, Item]],
+    org_id: str,
+    collections: List[str],
+    max_workers: int = None,
+    retry: RetryPolicy = None,
+    sync: bool = False,
+) -> BulkReport:
+    return get_default_client().move_items(
+        items, org_id, collections, max_workers, retry, sync
     )
 
 
 def add_org_collection(org_id: str, collection: Collection) -> Collection:
-    collection_dict = collection.to_dict()
-    response = post(
-        f"{BW_SERVER_URL}/object/org-collection?organizationId={org_id}",
-        # @TODO: organizationId might be organizationid
-        data=collection_dict,
-    )
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    try:
-        collection_obj = Collection.from_dict(response["data"])
-        return collection_obj
-    except KeyError:
-        raise Exception("Error creating Collection object")
+    return get_default_client().add_org_collection(org_id, collection)
 
 
 def edit_org_collection(
     org_id: str, collection_id: str, collection: Collection
 ) -> Collection:
-    collection_dict = collection.to_dict()
-    response = put(
-        f"{BW_SERVER_URL}/object/org-collection/{collection_id}?organizationId={org_id}",
-        # @TODO: organizationId might be organizationid
-        data=collection_dict,
-    )
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    try:
-        collection_obj = Collection.from_dict(response["data"])
-        return collection_obj
-    except KeyError:
-        raise Exception("Error creating Collection object")
+    return get_default_client().edit_org_collection(org_id, collection_id, collection)
 
 
 def get_org_collection(org_id: str, collection_id: str) -> Collection:
-    response = get(
-        f"{BW_SERVER_URL}/object/org-collection/{collection_id}?organizationId={org_id}"
-        # @TODO: organizationId might be organizationid
-    )
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    try:
-        collection_obj = Collection.from_dict(response["data"])
-        return collection_obj
-    except KeyError:
-        raise Exception("Error creating Collection object")
+    return get_default_client().get_org_collection(org_id, collection_id)
 
 
 def delete_org_collection(org_id: str, collection_id: str) -> dict:
-    return delete(
-        f"{BW_SERVER_URL}/object/org-collection/{collection_id}?organizationId={org_id}"
-        # @TODO: organizationId might be organizationid
-    )
+    return get_default_client().delete_org_collection(org_id, collection_id)
 
 
 def get_org_collections(org_id: str) -> List[Collection]:
-    response = get(
-        f"{BW_SERVER_URL}/list/object/org-collections?organizationId={org_id}"
-        # @TODO: organizationId might be organizationid
-    )
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    collections = []
-    for collection in response["data"]["data"]:
-        collections.append(Collection.from_dict(collection))
-    return collections
+    return get_default_client().get_org_collections(org_id)
 
 
 def get_collections(search_query: str = None) -> List[Collection]:
-    if search_query:
-        response = get(f"{BW_SERVER_URL}/list/object/collections?search={search_query}")
-    else:
-        response = get(f"{BW_SERVER_URL}/list/object/collections")
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    collections = []
-    for collection in response["data"]["data"]:
-        collections.append(Collection.from_dict(collection))
-    return collections
+    return get_default_client().get_collections(search_query)
 
 
 def get_organizations(search_query: str = None) -> list:
-    if search_query:
-        response = get(
-            f"{BW_SERVER_URL}/list/object/organizations?search={search_query}"
-        )
-    else:
-        response = get(f"{BW_SERVER_URL}/list/object/organizations")
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    organizations = []
-    for organization in response["data"]["data"]:
-        # we don't have an Organization class
-        organizations.append(organization)
-    return organizations
+    return get_default_client().get_organizations(search_query)
 
 
 def get_org_members(org_id: str) -> List[OrgMember]:
-    response = get(f"{BW_SERVER_URL}/list/object/org-members/{org_id}")
-    if not isinstance(response, dict) or "data" not in response:
-        raise Exception("Invalid server response: Missing or invalid 'data' field")
-    members = []
-    for member in response["data"]["data"]:
-        members.append(OrgMember.from_dict(member))
-    return members
+    return get_default_client().get_org_members(org_id)
 
 
 def confirm_org_member(org_id: str, member_id: str) -> dict:
-    return post(
-        f"{BW_SERVER_URL}/confirm/org-member/{member_id}?organizationId={org_id}"
-        # @TODO: organizationId might be organizationid
-    )
+    return get_default_client().confirm_org_member(org_id, member_id)
+
+
+def confirm_org_members(
+    org_id: str, members: Iterable[Union[str, OrgMember]], max_workers: int = None
+) -> BulkReport:
+    return get_default_client().confirm_org_members(org_id, members, max_workers)
 
 
 # Run